@@ -3,22 +3,28 @@ Streamlit App for Deep Research
 A user-friendly interface for conducting deep research using OpenAI's API.
 
 This app follows the EXACT flow from deep_research_clone.py:
-1. setup_openai_client() - Initialize OpenAI client
+1. get_client() - Get the shared async OpenAI client
 2. generate_clarifying_questions() - Generate 5 clarifying questions
 3. User provides answers
 4. generate_research_plan() - Generate research goal and initial queries
 5. conduct_research_iteratively() - Iterative research loop:
-   - run_search() for each query
+   - run_searches() runs every query concurrently on an asyncio event loop
    - evaluate_research_completeness() after each batch
    - generate_additional_queries() if incomplete
    - Repeat until complete
-6. generate_final_report() - Generate comprehensive report
+6. generate_final_report() - Stream the comprehensive report
 """
 
 import streamlit as st
-import deep_research_clone as drc
+import hashlib
 import warnings
 import logging
+import threading
+import time
+import uuid
+
+# deep_research_clone (and the openai SDK it imports) is imported lazily where
+# first needed, so the first script run renders before any API key is entered.
 
 # Suppress Streamlit's ScriptRunContext warning (harmless warning during initialization)
 warnings.filterwarnings("ignore", message=".*missing ScriptRunContext.*")
@@ -91,43 +97,136 @@ def init_session_state():
         pass
     
     defaults = {
+        'session_id': str(uuid.uuid4()),  # Key into _blob_store() for collected_data
         'step': 'topic_input',
         'topic': '',
         'client': None,
+        'tenant_id': None,  # Hash of the API key, part of every cached LLM call's key
         'questions': [],
         'questions_response_id': None,
         'answers': [],
         'goal': '',
         'queries': [],
         'goal_response_id': None,
-        'collected_data': [],
+        'research_context_id': None,
+        'results_sent': 0,
         'report': '',
         'research_iteration': 0,
         'current_queries': [],
-        'is_research_complete': False
+        'is_research_complete': False,
+        'needs_queries': False,  # Last evaluation was incomplete; follow-up queries not yet generated
+        'research_stopped': None,  # Reason the loop ended without a complete verdict
+        'research_error': None
     }
     for key, value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+        st.session_state.setdefault(key, value)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Seconds without access after which a session's collected_data is dropped
+# (sessions abandoned in the browser never call reset_session())
+BLOB_TTL = 2 * 60 * 60
+
+
+@st.cache_resource
+def _blob_store():
+    """
+    Process-wide store for large per-session data: session_id -> [last_access, data].
+    collected_data grows with every search, so it is kept here instead of in
+    st.session_state, which only holds lightweight state.
+    """
+    return {}, threading.Lock()
+
+
+def _session_blob(reset=False):
+    """
+    Return this session's entry in the blob store, creating (or, with reset,
+    replacing) it. Entries idle for longer than BLOB_TTL are pruned first.
+    """
+    store, lock = _blob_store()
+    now = time.monotonic()
+    with lock:
+        for session_id in [k for k, (last_access, _) in store.items() if now - last_access > BLOB_TTL]:
+            del store[session_id]
+        
+        entry = store.get(st.session_state.session_id)
+        if entry is None or reset:
+            entry = store[st.session_state.session_id] = [now, []]
+        entry[0] = now
+        return entry[1]
+
+
+def get_collected_data():
+    """Return this session's collected research results (a live list)."""
+    return _session_blob()
+
+
+def reset_collected_data():
+    """Start this session's collected research results over."""
+    _session_blob(reset=True)
+
+
 def reset_session():
-    """Reset all session state variables to initial state."""
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    """Reset all session state variables to initial state and drop cached LLM results."""
+    store, lock = _blob_store()
+    with lock:
+        store.pop(st.session_state.get('session_id'), None)
+    st.session_state.clear()
+    cached_clarifying_questions.clear()
+    cached_research_plan.clear()
     init_session_state()
 
 
+def get_openai_client(api_key):
+    """
+    drc's shared async OpenAI client for this API key: one per key across
+    sessions and reruns, so its HTTP connection pool is reused instead of
+    rebuilt for every session. Its calls all run on drc's shared background
+    event loop.
+    """
+    import deep_research_clone as drc  # Deferred: pulls in the openai SDK
+    return drc.get_client(api_key)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_clarifying_questions(topic, tenant_id, _client):
+    """
+    drc.generate_clarifying_questions() cached on the topic, so a redundant
+    rerun does not pay for the same API call twice. The client is not hashed;
+    tenant_id (see api_key_tenant_id()) keeps sessions with different API keys
+    from sharing response IDs, which only resolve within their own account.
+    """
+    import deep_research_clone as drc
+    return drc.run_async(drc.generate_clarifying_questions(_client, topic))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_research_plan(topic, questions, answers, tenant_id, _client, _previous_response_id=None):
+    """
+    drc.generate_research_plan() cached on (topic, questions, answers, tenant_id).
+    Pass questions and answers as tuples so they hash stably.
+    """
+    import deep_research_clone as drc
+    return drc.run_async(drc.generate_research_plan(
+        _client, topic, list(questions), list(answers), _previous_response_id
+    ))
+
+
+def api_key_tenant_id(api_key):
+    """A stable, non-reversible ID for an API key, safe to use in cache keys."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
 def initialize_client(api_key):
     """
-    Initialize OpenAI client - matches deep_research_clone.py setup_openai_client()
+    Initialize OpenAI client - matches deep_research_clone.py get_client()
     """
     try:
-        st.session_state.client = drc.setup_openai_client(api_key)
+        st.session_state.client = get_openai_client(api_key)
+        st.session_state.tenant_id = api_key_tenant_id(api_key)
         return True
     except Exception as e:
         st.error(f"Error initializing client: {str(e)}")
@@ -168,12 +267,12 @@ with st.sidebar:
     **Step 4:** `generate_research_plan()` - Creates goal & queries
     
     **Step 5:** `conduct_research_iteratively()`:
-    - `run_search()` for each query
+    - `run_searches()` - all queries in parallel
     - `evaluate_research_completeness()`
     - `generate_additional_queries()` if needed
     - Repeats until complete
     
-    **Step 6:** `generate_final_report()` - Creates report
+    **Step 6:** `generate_final_report()` - Streams the report
     """)
 
 st.title("🔍 Deep Research Assistant")
@@ -189,11 +288,12 @@ if not final_api_key:
 
 # ============================================================================
 # STEP 1: TOPIC INPUT
+# STEP 2: GENERATE CLARIFYING QUESTIONS (inline in the "Next →" handler)
 # ============================================================================
 
 if st.session_state.step == 'topic_input':
     st.header("📝 Step 1: Enter Research Topic")
-    st.markdown("**Function:** User input (prepares for `setup_openai_client()`)")
+    st.markdown("**Function:** User input, then `drc.generate_clarifying_questions(client, topic)`")
     
     topic_input = st.text_input(
         "What would you like to research?",
@@ -204,53 +304,42 @@ if st.session_state.step == 'topic_input':
     
     col1, col2 = st.columns([1, 5])
     with col1:
-        if st.button("Next →", type="primary", disabled=not topic_input):
-            if initialize_client(final_api_key):
-                st.session_state.topic = topic_input
-                st.session_state.step = 'generating_questions'
-                st.rerun()
+        next_clicked = st.button("Next →", type="primary", disabled=not topic_input)
     
     with col2:
         if st.button("🔄 Reset"):
             reset_session()
             st.rerun()
-
-
-# ============================================================================
-# STEP 2: GENERATE CLARIFYING QUESTIONS
-# ============================================================================
-
-elif st.session_state.step == 'generating_questions':
-    st.header("❓ Step 2: Generating Clarifying Questions")
-    st.markdown("**Function:** `drc.generate_clarifying_questions(client, topic)`")
     
-    with st.spinner("Generating 5 clarifying questions to understand your research needs..."):
-        try:
-            # Exact match to deep_research_clone.py: generate_clarifying_questions()
-            questions, questions_response_id = drc.generate_clarifying_questions(
-                st.session_state.client, 
-                st.session_state.topic
-            )
-            
-            st.session_state.questions = questions
-            st.session_state.questions_response_id = questions_response_id
-            st.session_state.step = 'answer_questions'
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"Error generating questions: {str(e)}")
-            if st.button("← Back"):
-                st.session_state.step = 'topic_input'
+    if next_clicked and initialize_client(final_api_key):
+        st.session_state.topic = topic_input
+        
+        with st.spinner("Generating 5 clarifying questions to understand your research needs..."):
+            try:
+                # Exact match to deep_research_clone.py: generate_clarifying_questions()
+                questions, questions_response_id = cached_clarifying_questions(
+                    st.session_state.topic,
+                    st.session_state.tenant_id,
+                    st.session_state.client
+                )
+                
+                st.session_state.questions = questions
+                st.session_state.questions_response_id = questions_response_id
+                st.session_state.step = 'answer_questions'
                 st.rerun()
+                
+            except Exception as e:
+                st.error(f"Error generating questions: {str(e)}")
 
 
 # ============================================================================
 # STEP 3: ANSWER QUESTIONS
+# STEP 4: GENERATE RESEARCH PLAN (inline in the "Start Research →" handler)
 # ============================================================================
 
 elif st.session_state.step == 'answer_questions':
     st.header("💬 Step 3: Answer Clarifying Questions")
-    st.markdown("**Function:** User input (prepares for `generate_research_plan()`)")
+    st.markdown("**Function:** User input, then `drc.generate_research_plan(client, topic, questions, answers, questions_response_id)`")
     st.info("Please answer the following questions to help us understand your research needs better.")
     
     # Initialize answers list if needed
@@ -276,55 +365,39 @@ elif st.session_state.step == 'answer_questions':
     
     with col2:
         all_answered = all(answer.strip() for answer in st.session_state.answers if answer)
-        if st.button("Start Research →", type="primary", disabled=not all_answered):
-            st.session_state.step = 'generating_plan'
-            st.rerun()
-
-
-# ============================================================================
-# STEP 4: GENERATE RESEARCH PLAN (GOAL & QUERIES)
-# ============================================================================
-
-elif st.session_state.step == 'generating_plan':
-    st.header("📋 Step 4: Generating Research Plan")
-    st.markdown("**Function:** `drc.generate_research_plan(client, topic, questions, answers, questions_response_id)`")
+        start_clicked = st.button("Start Research →", type="primary", disabled=not all_answered)
     
-    with st.spinner("Generating research goal and initial search queries..."):
-        try:
-            # Exact match to deep_research_clone.py: generate_research_plan()
-            goal, queries, goal_response_id = drc.generate_research_plan(
-                st.session_state.client,
-                st.session_state.topic,
-                st.session_state.questions,
-                st.session_state.answers,
-                st.session_state.questions_response_id
-            )
-            
-            # Store all state for iterative research
-            st.session_state.goal = goal
-            st.session_state.queries = queries
-            st.session_state.goal_response_id = goal_response_id
-            st.session_state.current_queries = queries.copy()  # Start with initial queries
-            st.session_state.research_iteration = 0
-            st.session_state.collected_data = []
-            st.session_state.is_research_complete = False
-            
-            # Display goal and queries
-            st.subheader("🎯 Research Goal")
-            st.info(goal)
-            
-            st.subheader("📊 Initial Search Queries")
-            for i, query in enumerate(queries, 1):
-                st.write(f"{i}. {query}")
-            
-            st.session_state.step = 'conducting_research'
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"Error generating research plan: {str(e)}")
-            if st.button("← Back"):
-                st.session_state.step = 'answer_questions'
+    if start_clicked:
+        with st.spinner("Generating research goal and initial search queries..."):
+            try:
+                # Exact match to deep_research_clone.py: generate_research_plan()
+                goal, queries, goal_response_id = cached_research_plan(
+                    st.session_state.topic,
+                    tuple(st.session_state.questions),
+                    tuple(st.session_state.answers),
+                    st.session_state.tenant_id,
+                    st.session_state.client,
+                    st.session_state.questions_response_id
+                )
+                
+                # Store all state for iterative research
+                st.session_state.goal = goal
+                st.session_state.queries = queries
+                st.session_state.goal_response_id = goal_response_id
+                st.session_state.current_queries = queries  # Start with initial queries
+                st.session_state.research_iteration = 0
+                reset_collected_data()
+                st.session_state.research_context_id = goal_response_id  # Evaluation chain starts at the plan
+                st.session_state.results_sent = 0
+                st.session_state.is_research_complete = False
+                st.session_state.needs_queries = False
+                st.session_state.research_stopped = None
+                
+                st.session_state.step = 'conducting_research'
                 st.rerun()
+                
+            except Exception as e:
+                st.error(f"Error generating research plan: {str(e)}")
 
 
 # ============================================================================
@@ -333,122 +406,181 @@ elif st.session_state.step == 'generating_plan':
 # ============================================================================
 
 elif st.session_state.step == 'conducting_research':
+    import deep_research_clone as drc
+    
     st.header("🔬 Step 5: Conducting Iterative Research")
     st.markdown("""
     **Function:** `drc.conduct_research_iteratively(client, goal, queries, goal_response_id)`
     
     **Internal flow (matches deep_research_clone.py exactly):**
-    1. For each query: `drc.run_search(client, query)` 
-    2. After batch: `drc.evaluate_research_completeness(client, goal, collected_data)`
-    3. If incomplete: `drc.generate_additional_queries(client, goal, collected_data, goal_response_id)`
-    4. Repeat until evaluation returns True
+    1. All queries in parallel (asyncio): `drc.run_searches(client, queries)` 
+    2. After batch: `drc.evaluate_research_completeness(client, goal, new_results, context_id)`
+    3. If incomplete: `drc.generate_additional_queries(client, goal, [], context_id)`
+    4. Repeat until evaluation returns True (at most `drc.MAX_RESEARCH_ITERATIONS` times, stopping early if queries repeat)
     """)
     
-    progress_container = st.container()
-    status_container = st.container()
-    results_container = st.container()
-    
-    with progress_container:
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-    
-    try:
-        # Get current state (matches the loop in conduct_research_iteratively)
-        collected = st.session_state.collected_data.copy()
-        queries = st.session_state.current_queries.copy()
-        iteration = st.session_state.research_iteration
-        goal = st.session_state.goal
-        goal_response_id = st.session_state.goal_response_id
-        
-        # Show current iteration
-        with status_container:
-            st.info(f"🔄 Research Iteration: {iteration + 1}")
-            if queries:
-                st.write(f"**Executing {len(queries)} search queries in this batch...**")
-        
-        # Execute all queries in current batch
-        # This matches: for q in queries: collected.append(run_search(client, q))
-        for i, q in enumerate(queries):
-            status_text.text(f"🌐 Searching ({i+1}/{len(queries)}): {q}")
-            progress_bar.progress((i + 1) / len(queries) * 0.4)  # 0-40% for searches
-            
-            # Exact match to deep_research_clone.py: run_search()
-            search_result = drc.run_search(st.session_state.client, q)
-            collected.append(search_result)
-        
-        # Update collected data
-        st.session_state.collected_data = collected
+    @st.fragment
+    def research_step():
+        """
+        Run the research loop in place inside a fragment, so iterations do not
+        rerun the whole script. State is saved after every call, so a rerun
+        (e.g. from a sidebar change) resumes from the current iteration.
+        """
+        results_container = st.container()
         
-        # Evaluate completeness
-        # This matches: if evaluate_research_completeness(client, goal, collected): break
-        progress_bar.progress(0.5)
-        status_text.text("🔍 Evaluating research completeness...")
-        
-        is_complete = drc.evaluate_research_completeness(
-            st.session_state.client,
-            goal,
-            collected
-        )
-        
-        progress_bar.progress(0.6)
-        st.session_state.is_research_complete = is_complete
-        
-        # Display results
-        with results_container:
-            st.success(f"✅ Completed {len(collected)} total searches across {iteration + 1} iteration(s)")
-            with st.expander(f"View search results from iteration {iteration + 1}", expanded=False):
-                for idx, result in enumerate(collected[-len(queries):], 1):
-                    st.write(f"**Query {idx}:** {result['query']}")
-                    st.text_area(
-                        "Result", 
-                        result['research_output'], 
-                        height=100, 
-                        key=f"result_{iteration}_{idx}",
-                        disabled=True
-                    )
+        try:
+            with st.status("🔬 Researching...", expanded=True) as status:
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+                
+                # Loop until complete or stalled (matches the loop in conduct_research_iteratively).
+                # Each step picks up from the saved state, so Retry after a failed call
+                # repeats only that call: results searched but not yet evaluated are
+                # evaluated first, and a missing batch of follow-up queries is generated
+                # before anything new is searched.
+                while not (st.session_state.is_research_complete or st.session_state.research_stopped):
+                    # Get current state
+                    # collected is a live reference: extending it updates the store in place
+                    collected = get_collected_data()
+                    iteration = st.session_state.research_iteration
+                    goal = st.session_state.goal
+                    context_id = st.session_state.research_context_id
+                    seen = {drc.normalize_query(r['query']) for r in collected}
+                    
+                    if st.session_state.needs_queries:
+                        # Research incomplete - generate additional queries
+                        # This matches: queries, context_id = await generate_additional_queries(client, goal, [], context_id)
+                        progress_bar.progress(0.9)
+                        status_text.text("📝 Research incomplete. Generating additional queries...")
+                        
+                        # Exact match to deep_research_clone.py: generate_additional_queries()
+                        new_queries, context_id = drc.run_async(drc.generate_additional_queries(
+                            st.session_state.client,
+                            goal,
+                            [],
+                            context_id
+                        ))
+                        
+                        # Update for next iteration
+                        st.session_state.research_context_id = context_id
+                        st.session_state.current_queries = new_queries
+                        st.session_state.research_iteration = iteration + 1
+                        st.session_state.needs_queries = False
+                        
+                        with results_container:
+                            st.warning(f"⚠️ Research not yet complete. Generated {len(new_queries)} additional queries for next iteration.")
+                            with st.expander(f"View new queries for iteration {iteration + 2}", expanded=False):
+                                for i, query in enumerate(new_queries, 1):
+                                    st.write(f"{i}. {query}")
+                        
+                        overlap = drc.query_overlap(new_queries, seen)
+                        if overlap >= drc.QUERY_OVERLAP_LIMIT:
+                            st.session_state.research_stopped = f"{overlap:.0%} of the new queries were already searched"
+                            break
+                        continue
+                    
+                    if st.session_state.results_sent == len(collected):
+                        # Skip queries already searched in earlier iterations
+                        queries = drc.filter_new_queries(st.session_state.current_queries, seen)
+                        if not queries:
+                            st.session_state.research_stopped = "no new queries to search"
+                            break
+                        
+                        status.update(label=f"🔄 Research Iteration {iteration + 1}: executing {len(queries)} search queries...")
+                        
+                        # Execute all queries in current batch concurrently
+                        # This matches: collected.extend(await run_searches(client, queries))
+                        progress_bar.progress(0)
+                        status_text.text(f"🌐 Searching {len(queries)} queries in parallel...")
+                        completed = []
+                        
+                        def on_search_complete(result):
+                            completed.append(result)
+                            status_text.text(f"🌐 Finished ({len(completed)}/{len(queries)}): {result['query']}")
+                            progress_bar.progress(len(completed) / len(queries) * 0.7)  # 0-70% for searches
+                        
+                        # Synchronous bridge to deep_research_clone.py: run_searches()
+                        collected.extend(drc.run_searches_sync(st.session_state.client, queries, on_result=on_search_complete))
+                    else:
+                        # Retry after a failed evaluation: this batch is already searched
+                        status.update(label=f"🔄 Research Iteration {iteration + 1}: evaluating results already searched...")
+                    
+                    # Evaluate completeness, sending only results not yet in the chained context
+                    # This matches: is_complete, context_id = await evaluate_research_completeness(client, goal, collected[sent:], context_id)
+                    progress_bar.progress(0.8)
+                    status_text.text("🔍 Evaluating research completeness...")
+                    
+                    batch_start = st.session_state.results_sent
+                    is_complete, context_id = drc.run_async(drc.evaluate_research_completeness(
+                        st.session_state.client,
+                        goal,
+                        collected[batch_start:],
+                        context_id
+                    ))
+                    
+                    st.session_state.research_context_id = context_id
+                    st.session_state.results_sent = len(collected)
+                    st.session_state.is_research_complete = is_complete
+                    
+                    # Display results
+                    with results_container:
+                        st.success(f"✅ Completed {len(collected)} total searches across {iteration + 1} iteration(s)")
+                        with st.expander(f"View search results from iteration {iteration + 1}", expanded=False):
+                            for idx in range(batch_start, len(collected)):
+                                result = collected[idx]
+                                st.write(f"**Query {idx - batch_start + 1}:** {result['query']}")
+                                st.text_area(
+                                    "Result", 
+                                    result['research_output'], 
+                                    height=100, 
+                                    key=f"result_{iteration}_{idx - batch_start + 1}",
+                                    disabled=True
+                                )
+                    
+                    if is_complete:
+                        # Research is complete - matches the break in conduct_research_iteratively
+                        break
+                    
+                    if iteration + 1 == drc.MAX_RESEARCH_ITERATIONS:
+                        st.session_state.research_stopped = f"reached the {drc.MAX_RESEARCH_ITERATIONS}-iteration limit"
+                        break
+                    
+                    st.session_state.needs_queries = True
+                
+                progress_bar.progress(1.0)
+                if st.session_state.research_stopped:
+                    status_text.text("⚠️ Research stopped before the goal was fully met. Generating final report from what was found...")
+                    status.update(label=f"⚠️ Research stopped: {st.session_state.research_stopped}", state="complete", expanded=False)
+                else:
+                    status_text.text("✅ Research complete! All information gathered. Generating final report...")
+                    status.update(label="✅ Research complete!", state="complete", expanded=False)
         
-        if is_complete:
-            # Research is complete - matches the break in conduct_research_iteratively
-            progress_bar.progress(1.0)
-            status_text.text("✅ Research complete! All information gathered. Generating final report...")
-            st.session_state.step = 'generating_report'
-            st.rerun()
-        else:
-            # Research incomplete - generate additional queries
-            # This matches: queries = generate_additional_queries(client, goal, collected, goal_response_id)
-            progress_bar.progress(0.7)
-            status_text.text("📝 Research incomplete. Generating additional queries...")
-            
-            # Exact match to deep_research_clone.py: generate_additional_queries()
-            new_queries = drc.generate_additional_queries(
-                st.session_state.client,
-                goal,
-                collected,
-                goal_response_id
-            )
-            
-            # Update for next iteration
-            st.session_state.current_queries = new_queries
-            st.session_state.research_iteration = iteration + 1
-            
-            with results_container:
-                st.warning(f"⚠️ Research not yet complete. Generated {len(new_queries)} additional queries for next iteration.")
-                with st.expander("View new queries for next iteration", expanded=False):
-                    for i, query in enumerate(new_queries, 1):
-                        st.write(f"{i}. {query}")
-            
-            # Continue to next iteration (matches the loop in conduct_research_iteratively)
-            st.session_state.step = 'conducting_research'
+        except Exception as e:
+            # Show the error outside the fragment so "← Back" does not re-run research
+            import traceback
+            st.session_state.research_error = (str(e), traceback.format_exc())
             st.rerun()
         
-    except Exception as e:
-        st.error(f"Error during research: {str(e)}")
-        import traceback
+        st.session_state.step = 'generating_report'
+        st.rerun()
+    
+    if st.session_state.research_error:
+        message, details = st.session_state.research_error
+        st.error(f"Error during research: {message}")
         with st.expander("Error details"):
-            st.code(traceback.format_exc())
-        if st.button("← Back"):
-            st.session_state.step = 'generating_plan'
-            st.rerun()
+            st.code(details)
+        col1, col2 = st.columns([1, 5])
+        with col1:
+            if st.button("← Back"):
+                st.session_state.research_error = None
+                st.session_state.step = 'answer_questions'
+                st.rerun()
+        with col2:
+            if st.button("🔁 Retry"):
+                st.session_state.research_error = None
+                st.rerun()
+    else:
+        research_step()
 
 
 # ============================================================================
@@ -456,25 +588,25 @@ elif st.session_state.step == 'conducting_research':
 # ============================================================================
 
 elif st.session_state.step == 'generating_report':
+    import deep_research_clone as drc
+    
     st.header("📝 Step 6: Generating Final Report")
     st.markdown("**Function:** `drc.generate_final_report(client, goal, collected_data)`")
     
-    progress_bar = st.progress(0)
     status_text = st.empty()
     
     try:
-        progress_bar.progress(0.3)
         status_text.text("📝 Writing comprehensive research report with citations...")
         
-        # Exact match to deep_research_clone.py: generate_final_report()
-        final_report = drc.generate_final_report(
+        # Exact match to deep_research_clone.py: generate_final_report(), rendered as it streams
+        final_report = st.write_stream(drc.iter_async(drc.generate_final_report(
             st.session_state.client,
             st.session_state.goal,
-            st.session_state.collected_data
-        )
+            get_collected_data(),
+            min_tokens_before_yield=8  # Fewer, larger chunks: each one re-renders the markdown
+        )))
         
         st.session_state.report = final_report
-        progress_bar.progress(1.0)
         status_text.text("✅ Report generated!")
         
         st.session_state.step = 'display_report'
@@ -505,9 +637,11 @@ elif st.session_state.step == 'display_report':
     # Display research summary
     with st.expander("📊 Research Summary", expanded=True):
         st.write(f"**Topic:** {st.session_state.topic}")
-        st.write(f"**Total Search Queries Executed:** {len(st.session_state.collected_data)}")
+        st.write(f"**Total Search Queries Executed:** {len(get_collected_data())}")
         st.write(f"**Research Iterations:** {st.session_state.research_iteration + 1}")
         st.write(f"**Research Status:** {'✅ Complete' if st.session_state.is_research_complete else '⚠️ Incomplete'}")
+        if st.session_state.research_stopped:
+            st.write(f"**Stopped Because:** {st.session_state.research_stopped}")
     
     # Display report
     st.subheader("📊 Research Report")
@@ -3,51 +3,640 @@ Deep Research Clone - Modular Research System
 This module provides functions for conducting deep research using OpenAI's API.
 """
 
-from openai import OpenAI
+from openai import (
+    APIConnectionError, APITimeoutError, AsyncOpenAI, DefaultAsyncHttpxClient,
+    InternalServerError, RateLimitError
+)
+from tenacity import (
+    AsyncRetrying, retry, retry_if_exception, stop_after_attempt,
+    wait_random_exponential
+)
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from contextlib import asynccontextmanager
+import asyncio
+import atexit
+import threading
+import weakref
+import httpx
+import tiktoken
+import diskcache
+import hashlib
+import orjson
 import os
-import json
-import itertools
+import re
+import logging
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
 # CONFIGURATION MODULE
 # ============================================================================
 
+# Connection pool of each client: HTTP/2 with keep-alive, so calls reuse
+# TLS handshakes and multiplex over a few connections
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
 def setup_openai_client(api_key=None):
     """
-    Initialize and configure the OpenAI client.
+    Initialize and configure a new async OpenAI client.
+    
+    Every API call in this module is a coroutine that awaits this client; use
+    run_async() / run_deep_research() to drive them from synchronous code.
+    Prefer get_client(), which shares one client (and connection pool) per
+    API key instead of building a new one.
     
     Args:
         api_key (str, optional): OpenAI API key. If None, reads from environment variable.
     
     Returns:
-        OpenAI: Configured OpenAI client instance
+        AsyncOpenAI: Configured async OpenAI client instance
     """
     if api_key:
         os.environ['OPENAI_API_KEY'] = api_key
     elif not os.environ.get('OPENAI_API_KEY'):
         raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
     
-    return OpenAI()
+    # max_retries=0: retries are handled by _safe_responses_create() alone, so
+    # every attempt goes through the concurrency and rate limits
+    return AsyncOpenAI(
+        http_client=DefaultAsyncHttpxClient(http2=True, limits=HTTP_LIMITS),
+        max_retries=0
+    )
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """
+    Return the event loop that runs async calls for synchronous callers.
+    
+    The loop is started once, in a daemon thread, and shared by every caller
+    (including concurrent Streamlit sessions), so an AsyncOpenAI client's
+    connection pool always stays on the same loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="deep-research-loop", daemon=True).start()
+    return _loop
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+    
+    Args:
+        coro (coroutine): The coroutine to run
+    
+    Returns:
+        The coroutine's return value (exceptions are re-raised)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+_EXHAUSTED = object()
+
+
+async def _anext_or_exhausted(agen):
+    """Return the next item of an async generator, or _EXHAUSTED when it is done."""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+def iter_async(aiterable):
+    """
+    Iterate an async iterable from synchronous code (e.g. st.write_stream).
+    
+    Each item is pulled on the shared background event loop; the iterator is
+    closed there if the caller stops early.
+    
+    Args:
+        aiterable (async iterable): An async generator, or e.g. a ReportHandle
+    
+    Yields:
+        The iterable's items, in order
+    """
+    loop = _background_loop()
+    agen = aiter(aiterable)
+    try:
+        while True:
+            item = asyncio.run_coroutine_threadsafe(_anext_or_exhausted(agen), loop).result()
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
+
+
+async def _on_client_loop(coro):
+    """
+    Await a coroutine that uses an OpenAI client on the shared background loop.
+    
+    An httpx connection pool must only be used on the loop it was created
+    for, so every API call runs there, whichever loop awaits it (e.g. one
+    started by asyncio.run()); cancelling the caller cancels the call.
+    """
+    loop = _background_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def _iter_on_client_loop(agen):
+    """Iterate an async generator on the shared background loop (see _on_client_loop())."""
+    try:
+        while True:
+            item = await _on_client_loop(_anext_or_exhausted(agen))
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        await _on_client_loop(agen.aclose())
+
+
+# Shared clients: api_key -> AsyncOpenAI, all used on the background loop
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key=None):
+    """
+    Return the shared async OpenAI client for an API key.
+    
+    The client is built on first use (see setup_openai_client()) and reused by
+    every later call with the same API key, so its HTTP/2 connections stay
+    warm across research runs, from any event loop: its requests always run on
+    the shared background loop (see _on_client_loop()), where it is closed at
+    exit.
+    
+    Args:
+        api_key (str, optional): OpenAI API key. If None, reads from environment variable.
+    
+    Returns:
+        AsyncOpenAI: Shared async OpenAI client instance
+    """
+    key = api_key or os.environ.get('OPENAI_API_KEY')
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = setup_openai_client(api_key)
+        return _clients[key]
+
+
+def _close_clients():
+    """Close the shared clients on the background loop (registered with atexit)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+    if not clients:
+        return
+    
+    loop = _background_loop()
+    for client in clients:
+        try:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+        except Exception:
+            logger.debug("Could not close OpenAI client at exit", exc_info=True)
+
+
+atexit.register(_close_clients)
 
 
 # Model configuration constants
+# MODEL is kept for the research plan and the long-form final report; web
+# searches, query generation and evaluation use the cheaper, faster MODEL_MINI
 MODEL = "gpt-4.1"
 MODEL_MINI = "gpt-4.1-mini"
-TOOLS = [{"type": "web_search"}]
+TOOLS = ({"type": "web_search"},)  # Tuple: shared by every search call and never mutated
+
+# Characters of each search result kept in the summaries sent to evaluation prompts
+SUMMARY_MAX_CHARS = 500
+
+# Research stops after MAX_RESEARCH_ITERATIONS search batches, or earlier when
+# at least QUERY_OVERLAP_LIMIT of a batch of follow-up queries was already searched
+MAX_RESEARCH_ITERATIONS = 5
+QUERY_OVERLAP_LIMIT = 0.8
+
+# Batches of at least SEARCH_BATCH_MIN uncached queries are marshaled into
+# combined web search calls of up to SEARCH_BATCH_SIZE queries each
+SEARCH_BATCH_MIN = 3
+SEARCH_BATCH_SIZE = 5
+
+# Client-side limits shared by every Responses API call of a client (i.e. of
+# an API key, whose account has its own OpenAI rate limits): at most
+# API_CONCURRENCY requests in flight, paced to API_RPM requests and API_TPM
+# (estimated input) tokens per minute
+API_CONCURRENCY = int(os.getenv("DEEP_RESEARCH_CONCURRENCY", 8))
+API_RPM = int(os.getenv("DEEP_RESEARCH_RPM", 500))
+API_TPM = int(os.getenv("DEEP_RESEARCH_TPM", 200_000))
+
+# Report inputs over REPORT_INPUT_BUDGET tokens are map-reduced: summarized in
+# parallel chunks of up to REPORT_CHUNK_TOKENS tokens, then written from the summaries
+REPORT_INPUT_BUDGET = 100_000
+REPORT_CHUNK_TOKENS = 8_000
+
+# Search results citing the same pages whose 64-bit SimHashes differ in at most
+# SIMHASH_MAX_DISTANCE bits are near-duplicates, sent to the final report only once
+SIMHASH_MAX_DISTANCE = 3
+
+# Upper bound on the length of the final report (the slowest call in the pipeline)
+REPORT_MAX_TOKENS = int(os.getenv("DEEP_RESEARCH_REPORT_TOKENS", 4096))
+
+# Disk-backed cache of web search results, shared across iterations and
+# sessions; kept next to this module and opened on first use (see _search_cache())
+SEARCH_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".search_cache")
+SEARCH_CACHE_TTL = 24 * 60 * 60  # seconds
+_search_cache_db = None
+_search_cache_lock = threading.Lock()
+
+# In-process LRU cache of model replies to identical requests (see
+# cached_responses_create()), bounded in both age and size
+RESPONSE_CACHE_TTL = 60 * 60  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = 256
+_response_cache = OrderedDict()  # request key -> (expires_at, text, response_id), oldest first
 
 # Developer message for AI instructions
-DEVELOPER_MESSAGE = """
-You are an expert Deep Researcher.
-You provide complete and in depth research to the user.
+DEVELOPER_MESSAGE = "You are an expert deep researcher. Give complete, in-depth research."
+
+# Prompt templates, filled in with str.format() at each call site
+_CLARIFY_TEMPLATE = """
+Ask 5 numbered clarifying question to the user about the topic: {topic}.
+The goal os the questions is to understand the intended purpose of the research.
+Reply only with the questions
+"""
+
+_PLAN_TEMPLATE = """
+Using the user answers {answers} to que questions {questions}, write a goal sentence and 5 web search queries for the research about {topic}
+Output: A json list of the goal and the 5 web search queries that will reach it.
+Format: {{"goal": "...", "queries": ["q1", ....]}}
+"""
+
+# Used when no clarifying questions were asked (answers supplied up front)
+_PLAN_DIRECT_TEMPLATE = """
+Using the user notes {answers} about the intended purpose of the research, write a goal sentence and 5 web search queries for the research about {topic}
+Output: A json list of the goal and the 5 web search queries that will reach it.
+Format: {{"goal": "...", "queries": ["q1", ....]}}
 """
 
+_BATCH_SEARCH_TEMPLATE = (
+    "Perform a web search for each numbered query below. Reply only with a JSON list, "
+    "one object per query in the same order: "
+    '[{{"query": "...", "research_output": "...", "sources": ["url", ...]}}, ...]\n'
+    "{numbered}"
+)
+
+_EVALUATE_PROMPT = (
+    "Does this information fully satisfy the goal? "
+    'Answer as JSON: {"complete": true} or {"complete": false}'
+)
+
+_ADDITIONAL_PROMPT = (
+    "This has not met the research goal. Write 5 other web searchs to achieve the goal. "
+    'Reply only with a JSON list: ["q1", ...]'
+)
+
+_VERIFY_PROMPT = (
+    "Write 5 web searches that would confirm the findings so far or fill remaining gaps "
+    'for the research goal. Reply only with a JSON list: ["q1", ...]'
+)
+
+_CITATION_DIRECTIVE = "Cite sources inline as [n]; end with a reference list mapping [n] to url."
+
+_REPORT_PROMPT = "Write a complete, detailed report on the research goal. " + _CITATION_DIRECTIVE
+
+# Used when the report chains onto the research context instead of re-sending the data
+_REPORT_CHAINED_PROMPT = "Write the final report from the research findings above. " + _CITATION_DIRECTIVE
+
+# Appended to a final report that was cut off before it was finished
+_TRUNCATED_NOTE = (
+    "\n\n---\n*This report was cut off at its length limit; "
+    "the end, including the reference list, may be missing.*"
+)
+
+# Map-reduce report for oversized inputs (sources are numbered once, globally)
+_MAP_PROMPT = (
+    "Summarize these findings as they bear on the research goal. "
+    "Keep each fact's source number as [n], using only the numbers given."
+)
+
+_REDUCE_PROMPT = (
+    "Write a complete, detailed report on the research goal from the summaries above. "
+    "Cite sources inline with their [n] numbers; end with a reference list mapping [n] to url."
+)
+
+
+def _goal_message(goal):
+    """
+    The research goal as a developer message, identical on every call.
+    
+    Calls that know the goal lead with it (right after DEVELOPER_MESSAGE in
+    instructions) and put per-turn content after it, so the start of each
+    request is a stable prefix that OpenAI's automatic prompt caching can reuse.
+    """
+    return {"role": "developer", "content": f"Research goal: {goal}"}
+
+
+# Outermost JSON object or list in a model reply (which may include ```json fences or commentary)
+_JSON_RE = re.compile(r"\{.*\}|\[.*\]", re.DOTALL)
+
+
+def extract_json(text):
+    """
+    Parse the JSON object or list embedded in a model reply.
+    
+    Tolerates Markdown code fences and surrounding commentary, so a reply
+    that contains well-formed JSON is used without another API round-trip.
+    
+    Args:
+        text (str): Model output text
+    
+    Returns:
+        dict | list: The parsed JSON value
+    
+    Raises:
+        ValueError: If the text contains no parseable JSON object or list
+    """
+    match = _JSON_RE.search(text)
+    if not match:
+        raise ValueError(f"No JSON found in model output: {text[:200]!r}")
+    return orjson.loads(match.group(0))
+
+
+# ============================================================================
+# RATE LIMITING MODULE
+# ============================================================================
+
+class TokenBucket:
+    """
+    Client-side requests-per-minute and tokens-per-minute throttle.
+    
+    Both budgets refill continuously; acquire() waits until one request and
+    the estimated tokens are available, so bursts of concurrent calls are
+    spread out instead of tripping the API's 429 rate limits.
+    """
+    
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+    
+    async def acquire(self, tokens):
+        """Wait for one request slot and `tokens` tokens (capped at the per-minute budget)."""
+        tokens = min(tokens, self.tpm)
+        async with self._lock:  # First come, first served
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max(
+                    (1 - self._requests) * 60 / self.rpm,
+                    (tokens - self._tokens) * 60 / self.tpm
+                )
+                await asyncio.sleep(wait)
+
+
+# Per client: client -> (semaphore, token bucket). Requests all run on the
+# background loop (see _on_client_loop()), so its asyncio primitives are only
+# ever bound to that one loop, and an entry goes away with its client.
+_limits = weakref.WeakKeyDictionary()
+
+_encoding = None  # MODEL's tiktoken encoding, once _load_encoding() has finished
+
+
+def _load_encoding():
+    """
+    Load MODEL's tiktoken encoding (the first load downloads its BPE file).
+    
+    Runs once, in a daemon thread started at import, so the blocking download
+    never runs on an event loop; until it finishes (or if it fails, e.g.
+    offline) count_tokens() falls back to an estimate.
+    """
+    global _encoding
+    try:
+        try:
+            _encoding = tiktoken.encoding_for_model(MODEL)
+        except KeyError:  # tiktoken releases that predate the model name
+            _encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("Could not load the tiktoken encoding (%s); estimating tokens from text length", e)
+        logger.debug("tiktoken encoding load failure", exc_info=True)
+
+
+threading.Thread(target=_load_encoding, name="deep-research-tiktoken", daemon=True).start()
+
+
+def _client_limits(client):
+    """Return the semaphore and token bucket for a client."""
+    if client not in _limits:
+        _limits[client] = (asyncio.Semaphore(API_CONCURRENCY), TokenBucket(API_RPM, API_TPM))
+    return _limits[client]
+
+
+def count_tokens(text):
+    """
+    Count the tokens of text in MODEL's tiktoken encoding.
+    
+    Never blocks or raises: while the encoding is unavailable (see
+    _load_encoding()) it returns the usual ~4 characters per token estimate.
+    """
+    encoding = _encoding
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def estimate_tokens(kwargs):
+    """
+    Estimate the input tokens of a Responses API request with tiktoken.
+    
+    Counts the instructions and the text of the input (a string or a list of
+    messages with string content); the server-side context of a
+    previous_response_id chain is not included.
+    """
+    input_ = kwargs.get("input", "")
+    if isinstance(input_, str):
+        texts = [input_]
+    else:
+        texts = [m.get("content", "") for m in input_ if isinstance(m.get("content"), str)]
+    texts.append(kwargs.get("instructions") or "")
+    
+    return sum(count_tokens(t) for t in texts)
+
+
+@asynccontextmanager
+async def _throttled(client, kwargs):
+    """Hold one of the client's concurrency slots, after waiting for its rate budget, for the duration of a request."""
+    semaphore, bucket = _client_limits(client)
+    async with semaphore:
+        await bucket.acquire(estimate_tokens(kwargs))
+        yield
+
+
+# Transient API errors: rate limits (429), server errors (5xx), dropped
+# connections and timeouts (the SDK's own retries are disabled)
+_RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError, APITimeoutError)
+_backoff = wait_random_exponential(multiplier=1, max=60)
+
+
+def _retry_after(error):
+    """Seconds the server asked us to wait (retry-after-ms / retry-after headers), or 0."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return 0.0
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = response.headers.get(header)
+        if value is None:
+            continue
+        try:
+            return float(value) / scale
+        except ValueError:  # An HTTP date rather than a number of seconds
+            continue
+    return 0.0
+
+
+def _is_transient(error):
+    """Whether an error is one of _RETRYABLE_ERRORS, except a 429 for an exhausted quota (a billing error)."""
+    if isinstance(error, RateLimitError) and error.code == "insufficient_quota":
+        return False
+    return isinstance(error, _RETRYABLE_ERRORS)
+
+
+def _wait_for_retry(retry_state):
+    """Jittered exponential backoff, but never shorter than the server's retry-after."""
+    error = retry_state.outcome.exception()
+    return max(_retry_after(error), _backoff(retry_state))
+
+
+@retry(
+    retry=retry_if_exception(_is_transient),
+    wait=_wait_for_retry,
+    stop=stop_after_attempt(6),
+    reraise=True
+)
+async def _responses_create(client, **kwargs):
+    """client.responses.create() within the limits, with retries (see _safe_responses_create())."""
+    async with _throttled(client, kwargs):
+        return await client.responses.create(**kwargs)
+
+
+async def _safe_responses_create(client, **kwargs):
+    """
+    client.responses.create(), within the client's concurrency and rate limits.
+    
+    Transient errors (rate limits, 5xx, connection errors, timeouts) are retried
+    up to 6 attempts with jittered exponential backoff (capped at 60s),
+    honoring the retry-after header of rate limited responses; a 429 for an
+    exhausted quota (insufficient_quota) fails at once. The call runs on the
+    shared background loop, whichever loop awaits it.
+    """
+    return await _on_client_loop(_responses_create(client, **kwargs))
+
+
+# ============================================================================
+# RESPONSE CACHE MODULE
+# ============================================================================
+
+def _digest(*parts):
+    """SHA-256 of the canonical (sorted-key) JSON encoding of parts."""
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _response_cache_key(goal, kwargs):
+    """Exact-match key: model, goal and the full (unchained) request."""
+    return _digest(kwargs.get("model"), goal, kwargs)
+
+
+def _response_cache_get(key):
+    """Return the unexpired (text, response_id) cached under key, or None."""
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return entry[1], entry[2]
+
+
+def _response_cache_set(key, text, response_id):
+    """
+    Cache a reply under an exact-match key for RESPONSE_CACHE_TTL seconds.
+    
+    Expired entries are swept first, then the least recently used ones are
+    evicted to keep at most RESPONSE_CACHE_MAX_ENTRIES.
+    """
+    now = time.monotonic()
+    for stale in [k for k, entry in _response_cache.items() if entry[0] < now]:
+        del _response_cache[stale]
+    
+    _response_cache[key] = (now + RESPONSE_CACHE_TTL, text, response_id)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+        _response_cache.popitem(last=False)
+
+
+async def cached_responses_create(client, goal, **kwargs):
+    """
+    Call client.responses.create(**kwargs) behind an exact-match response cache.
+    
+    Returns the cached reply to an identical request (same model, goal and
+    input) made in the last RESPONSE_CACHE_TTL seconds; otherwise calls the
+    API (see _safe_responses_create()) and caches the reply. A hit returns the
+    original response ID, which stays valid server-side for chaining.
+    
+    Requests that chain onto a previous_response_id bypass the cache: every
+    chained call follows a fresh response ID, so it could never hit.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal the request belongs to
+        **kwargs: Arguments for client.responses.create()
+    
+    Returns:
+        tuple: (text, response_id) - Reply text and API response ID
+    """
+    if kwargs.get("previous_response_id"):
+        response = await _safe_responses_create(client, **kwargs)
+        return response.output[0].content[0].text, response.id
+    
+    key = _response_cache_key(goal, kwargs)
+    cached = _response_cache_get(key)
+    if cached is not None:
+        return cached
+    
+    response = await _safe_responses_create(client, **kwargs)
+    text = response.output[0].content[0].text
+    
+    _response_cache_set(key, text, response.id)
+    return text, response.id
+
 
 # ============================================================================
 # QUESTION GENERATION MODULE
 # ============================================================================
 
-def generate_clarifying_questions(client, topic):
+async def generate_clarifying_questions(client, topic):
     """
     Generate 5 clarifying questions about the research topic.
     
@@ -57,21 +646,16 @@ def generate_clarifying_questions(client, topic):
     3. Parses the response to extract individual questions
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         topic (str): The research topic
     
     Returns:
         tuple: (questions_list, response_id) - List of questions and API response ID
     """
-    prompt_to_clarify = f"""
-Ask 5 numbered clarifying question to the user about the topic: {topic}.
-The goal os the questions is to understand the intended purpose of the research.
-Reply only with the questions
-"""
-    
-    clarify = client.responses.create(
+    clarify = await _safe_responses_create(
+        client,
         model=MODEL_MINI,
-        input=prompt_to_clarify,
+        input=_CLARIFY_TEMPLATE.format(topic=topic),
         instructions=DEVELOPER_MESSAGE
     )
     
@@ -85,44 +669,44 @@ Reply only with the questions
 # GOAL AND QUERY GENERATION MODULE
 # ============================================================================
 
-def generate_research_plan(client, topic, questions, answers, previous_response_id=None):
+async def generate_research_plan(client, topic, questions, answers, previous_response_id=None):
     """
     Generate research goal and search queries based on user answers.
     
     Step-by-step:
     1. Creates a prompt combining topic, questions, and user answers
+       (or topic and answers alone when no questions were asked)
     2. Asks the AI to generate a research goal and 5 web search queries
-    3. Parses JSON response to extract goal and queries
+    3. Extracts the JSON object from the response to get goal and queries
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         topic (str): The research topic
-        questions (list): List of clarifying questions asked
+        questions (list): List of clarifying questions asked (may be empty)
         answers (list): List of user answers to those questions
         previous_response_id (str, optional): Previous API response ID for context
     
     Returns:
         tuple: (goal, queries_list, response_id) - Research goal, list of queries, and API response ID
     """
-    prompt_goals = f"""
-Using the user answers {answers} to que questions {questions}, write a goal sentence and 5 web search queries for the research about {topic}
-Output: A json list of the goal and the 5 web search queries that will reach it.
-Format: {{"goal": "...", "queries": ["q1", ....]}}
-"""
+    if questions:
+        prompt = _PLAN_TEMPLATE.format(answers=answers, questions=questions, topic=topic)
+    else:
+        prompt = _PLAN_DIRECT_TEMPLATE.format(answers=answers, topic=topic)
     
     kwargs = {
         "model": MODEL,
-        "input": prompt_goals,
+        "input": prompt,
         "instructions": DEVELOPER_MESSAGE
     }
     
     if previous_response_id:
         kwargs["previous_response_id"] = previous_response_id
     
-    goal_and_queries = client.responses.create(**kwargs)
+    goal_and_queries = await _safe_responses_create(client, **kwargs)
     
     plan_text = goal_and_queries.output[0].content[0].text
-    plan = json.loads(plan_text)
+    plan = extract_json(plan_text)
     
     goal = plan["goal"]
     queries = plan["queries"]
@@ -134,227 +718,1125 @@ Format: {{"goal": "...", "queries": ["q1", ....]}}
 # WEB SEARCH MODULE
 # ============================================================================
 
-def run_search(client, query):
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Normalize a query for duplicate detection (case and whitespace insensitive)."""
+    return _WHITESPACE_RE.sub(" ", query.strip().lower())
+
+
+def filter_new_queries(queries, seen):
+    """
+    Drop queries that were already searched (or repeat within the batch).
+    
+    Args:
+        queries (list): Candidate search queries
+        seen (set): Normalized queries already searched; updated in place
+    
+    Returns:
+        list: Queries not yet searched, in their original order
+    """
+    new_queries = []
+    for q in queries:
+        key = normalize_query(q)
+        if key not in seen:
+            seen.add(key)
+            new_queries.append(q)
+    return new_queries
+
+
+def query_overlap(queries, seen):
+    """
+    Fraction of queries that were already searched.
+    
+    Args:
+        queries (list): Candidate search queries
+        seen (set): Normalized queries already searched
+    
+    Returns:
+        float: Between 0.0 and 1.0 (1.0 for an empty list)
+    """
+    if not queries:
+        return 1.0
+    return sum(normalize_query(q) in seen for q in queries) / len(queries)
+
+
+def _search_cache():
+    """Return the disk cache of search results, opening it on first use."""
+    global _search_cache_db
+    with _search_cache_lock:
+        if _search_cache_db is None:
+            _search_cache_db = diskcache.Cache(SEARCH_CACHE_DIR)
+    return _search_cache_db
+
+
+def _search_cache_key(query):
+    """Build the disk cache key for a search query (model-specific)."""
+    return hashlib.sha256(f"{MODEL_MINI}:{query}".encode()).hexdigest()
+
+
+def _cited_urls(content):
+    """The distinct URLs of a message content's url_citation annotations, in order."""
+    citations = []
+    for annotation in content.annotations or []:
+        if annotation.type == "url_citation" and annotation.url not in citations:
+            citations.append(annotation.url)
+    return citations
+
+
+def _search_result(query, message):
+    """Build a result dictionary from the message item of a web search response."""
+    content = message.content[0]
+    
+    return {
+        "query": query,
+        "resp_id": message.id,
+        "research_output": content.text,
+        "citations": _cited_urls(content)
+    }
+
+
+def _verified_sources(sources, cited):
+    """
+    Keep the self-reported sources of a batched result that the search really cited.
+    
+    Args:
+        sources (list | str): The "sources" value of one item of the model's JSON reply
+        cited (dict): Canonical URL -> URL, of the response's url_citation annotations
+    
+    Returns:
+        list: The cited URLs among sources, without duplicates
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    elif not isinstance(sources, list):
+        sources = []
+    
+    citations = []
+    for url in sources:
+        url = cited.get(canonicalize_url(url)) if isinstance(url, str) else None
+        if url is not None and url not in citations:
+            citations.append(url)
+    return citations
+
+
+async def _run_search_uncached(client, query):
+    """Call the web search tool for a query."""
+    web_search = await _safe_responses_create(
+        client,
+        model=MODEL_MINI,
+        input=f"search: {query}",
+        instructions=DEVELOPER_MESSAGE,
+        tools=TOOLS
+    )
+    
+    return _search_result(query, web_search.output[1])
+
+
+async def run_search(client, query):
     """
     Execute a web search query using OpenAI's web search tool.
     
     Step-by-step:
-    1. Formats the query with "search:" prefix
-    2. Calls OpenAI API with web_search tool enabled
-    3. Extracts search results from the response
-    4. Returns query, response ID, and research output
+    1. Returns the cached result if this query was searched in the last 24 hours
+    2. Otherwise formats the query with "search:" prefix
+    3. Calls OpenAI API with web_search tool enabled
+    4. Extracts search results and cited URLs from the response and caches them
+    5. Returns query, response ID, research output, and citations
+    
+    Transient failures are retried by _safe_responses_create().
+    
+    Kept for callers that search one query at a time: the research loop goes
+    through run_searches(), which reads and fills the same cache.
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         query (str): The search query to execute
     
     Returns:
-        dict: Dictionary containing query, response_id, and research_output
+        dict: Dictionary containing query, response_id, research_output, and citations
     """
-    web_search = client.responses.create(
-        model=MODEL,
-        input=f"search: {query}",
+    key = _search_cache_key(query)
+    cached = _search_cache().get(key)
+    if cached is not None:
+        return cached
+    
+    result = await _run_search_uncached(client, query)
+    _search_cache().set(key, result, expire=SEARCH_CACHE_TTL)
+    return result
+
+
+async def _run_searches_marshaled(client, queries):
+    """Run several queries in a single web search call; raises ValueError on malformed output."""
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(queries, 1))
+    web_search = await _safe_responses_create(
+        client,
+        model=MODEL_MINI,
+        input=_BATCH_SEARCH_TEMPLATE.format(numbered=numbered),
         instructions=DEVELOPER_MESSAGE,
         tools=TOOLS
     )
     
-    return {
-        "query": query,
-        "resp_id": web_search.output[1].id,
-        "research_output": web_search.output[1].content[0].text
+    message = web_search.output[-1]
+    items = extract_json(message.content[0].text)
+    if not isinstance(items, list) or len(items) != len(queries):
+        raise ValueError("Batched search returned a different number of results than queries")
+    
+    # The model's "sources" may be invented; only annotated citations are kept
+    cited = {canonicalize_url(url): url for url in _cited_urls(message.content[0])}
+    return [
+        {
+            "query": query,
+            "resp_id": message.id,
+            "research_output": item["research_output"],
+            "citations": _verified_sources(item.get("sources", []), cited)
+        }
+        for query, item in zip(queries, items)
+    ]
+
+
+async def run_searches_batched(client, queries):
+    """
+    Execute several search queries in one "row-marshaled" web search call.
+    
+    Step-by-step:
+    1. Numbers the queries into a single prompt asking for a JSON list of results
+    2. Calls OpenAI API once with web_search tool enabled
+    3. Maps each JSON item back to its query
+    4. Falls back to one concurrent run per query if the output cannot be parsed
+    
+    Fewer, larger calls get more research done per request when the rate
+    limit (RPM) is the bottleneck; keep batches to about SEARCH_BATCH_SIZE
+    queries, as per-call latency climbs quickly beyond that.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        queries (list): The search queries to execute
+    
+    Returns:
+        list: Result dictionaries in the same format as run_search(), in query order
+    """
+    try:
+        return await _run_searches_marshaled(client, queries)
+    except (ValueError, KeyError, TypeError):
+        return list(await asyncio.gather(*(_run_search_uncached(client, q) for q in queries)))
+
+
+async def _run_search_group(client, queries):
+    """Run one planned group of uncached queries (see _plan_search_groups())."""
+    if len(queries) > 1:
+        return await run_searches_batched(client, queries)
+    return [await _run_search_uncached(client, queries[0])]
+
+
+def _plan_search_groups(queries, results):
+    """
+    Fill cached results in place and group the remaining query indices.
+    
+    Full-size groups are marshaled into one call; leftovers smaller than
+    SEARCH_BATCH_MIN run individually.
+    
+    Returns:
+        tuple: (cached_indices, groups) - Indices served from the cache and lists of pending indices
+    """
+    cached_indices = []
+    pending = []
+    
+    for i, q in enumerate(queries):
+        cached = _search_cache().get(_search_cache_key(q))
+        if cached is not None:
+            results[i] = cached
+            cached_indices.append(i)
+        else:
+            pending.append(i)
+    
+    groups = []
+    for start in range(0, len(pending), SEARCH_BATCH_SIZE):
+        chunk = pending[start:start + SEARCH_BATCH_SIZE]
+        if len(chunk) >= SEARCH_BATCH_MIN:
+            groups.append(chunk)
+        else:
+            groups.extend([i] for i in chunk)
+    
+    return cached_indices, groups
+
+
+def _store_group_results(queries, group, group_results, results):
+    """Cache a finished group's results and place them at their query positions."""
+    for i, result in zip(group, group_results):
+        _search_cache().set(_search_cache_key(queries[i]), result, expire=SEARCH_CACHE_TTL)
+        results[i] = result
+
+
+async def run_searches(client, queries):
+    """
+    Execute a batch of web search queries concurrently with asyncio.
+    
+    Step-by-step:
+    1. Serves any query searched in the last 24 hours from the cache
+    2. Groups the rest into marshaled calls of up to SEARCH_BATCH_SIZE queries;
+       groups smaller than SEARCH_BATCH_MIN run as one call per query
+    3. Runs those calls with asyncio.gather (up to API_CONCURRENCY at once, see
+       _safe_responses_create())
+    4. Returns all results in the same order as the queries
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        queries (list): The search queries to execute
+    
+    Returns:
+        list: Result dictionaries from run_search(), in query order
+    """
+    results = [None] * len(queries)
+    _, groups = _plan_search_groups(queries, results)
+    
+    group_results = await asyncio.gather(*(
+        _run_search_group(client, [queries[i] for i in group]) for group in groups
+    ))
+    for group, batch in zip(groups, group_results):
+        _store_group_results(queries, group, batch, results)
+    
+    return results
+
+
+def run_searches_sync(client, queries, on_result=None):
+    """
+    Execute a batch of web search queries concurrently from synchronous code.
+    
+    Same planning as run_searches(), but every group is scheduled on the
+    shared background event loop and on_result is called from the calling
+    thread as each group finishes, so it is safe for UI updates.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        queries (list): The search queries to execute
+        on_result (callable, optional): Called with each result dict as it completes
+    
+    Returns:
+        list: Result dictionaries from run_search(), in query order
+    """
+    results = [None] * len(queries)
+    cached_indices, groups = _plan_search_groups(queries, results)
+    
+    if on_result:
+        for i in cached_indices:
+            on_result(results[i])
+    
+    loop = _background_loop()
+    futures = {
+        asyncio.run_coroutine_threadsafe(
+            _run_search_group(client, [queries[i] for i in group]), loop
+        ): group
+        for group in groups
     }
+    
+    try:
+        for future in as_completed(futures):
+            group = futures[future]
+            _store_group_results(queries, group, future.result(), results)
+            if on_result:
+                for i in group:
+                    on_result(results[i])
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    
+    return results
 
 
 # ============================================================================
 # EVALUATION MODULE
 # ============================================================================
 
-def evaluate_research_completeness(client, goal, collected_data):
+def summarize_result(result):
+    """
+    Condense a search result for evaluation and query-generation prompts.
+    
+    Only generate_final_report() needs the full research output; the other
+    prompts get the first SUMMARY_MAX_CHARS characters plus the cited URLs,
+    which keeps their input size from growing with every full result body.
+    
+    Args:
+        result (dict): A result dictionary from run_search()
+    
+    Returns:
+        dict: Dictionary containing query, truncated research_output, and citations
+    """
+    output = result["research_output"]
+    if len(output) > SUMMARY_MAX_CHARS:
+        output = output[:SUMMARY_MAX_CHARS] + "..."
+    
+    return {
+        "query": result["query"],
+        "research_output": output,
+        "citations": result.get("citations", [])
+    }
+
+
+def _summaries_json(collected_data):
+    """Serialize the summaries of all collected results as a JSON string."""
+    return orjson.dumps([summarize_result(r) for r in collected_data]).decode()
+
+
+async def evaluate_research_completeness(client, goal, collected_data, previous_response_id=None):
     """
     Evaluate if the collected research data is sufficient to meet the goal.
     
     Step-by-step:
-    1. Creates a prompt asking if collected information satisfies the research goal
-    2. Uses OpenAI API to evaluate completeness
-    3. Returns True if "yes" is in the response, False otherwise
+    1. Creates a prompt asking if the collected information (as summaries) satisfies the research goal
+    2. Chains onto previous_response_id so results sent earlier stay in server-side context
+    3. Uses OpenAI API (mini model, JSON mode) to evaluate completeness
+    4. Returns the boolean "complete" field of the JSON reply, plus the response ID
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         goal (str): The research goal to evaluate against
-        collected_data (list): List of research results collected so far
+        collected_data (list): Research results not yet sent to the previous_response_id
+            context (all results collected so far when not chaining)
+        previous_response_id (str, optional): Response ID holding the research context so far
     
     Returns:
-        bool: True if research is complete, False if more information is needed
+        tuple: (is_complete, response_id) - Completeness verdict and API response ID
     """
-    review = client.responses.create(
-        model=MODEL,
-        input=[
-            {"role": "developer", "content": f"Research goal: {goal}"},
-            {"role": "assistant", "content": json.dumps(collected_data)},
-            {"role": "user", "content": "Does this information will fully satisfy the goal? Answer Yes or No only."}
-        ],
-        instructions=DEVELOPER_MESSAGE
-    )
+    messages = [_goal_message(goal)]
+    if collected_data:
+        messages.append({"role": "assistant", "content": _summaries_json(collected_data)})
+    messages.append({"role": "user", "content": _EVALUATE_PROMPT})
+    
+    kwargs = {
+        "model": MODEL_MINI,
+        "input": messages,
+        "instructions": DEVELOPER_MESSAGE,
+        "text": {"format": {"type": "json_object"}}
+    }
+    
+    if previous_response_id:
+        kwargs["previous_response_id"] = previous_response_id
+    
+    review_text, review_id = await cached_responses_create(client, goal, **kwargs)
     
-    return "yes" in review.output[0].content[0].text.lower()
+    verdict = extract_json(review_text)
+    return verdict.get("complete") is True, review_id
 
 
-def generate_additional_queries(client, goal, collected_data, previous_response_id):
+async def generate_additional_queries(client, goal, collected_data, previous_response_id):
     """
     Generate additional search queries when initial research is insufficient.
     
     Step-by-step:
-    1. Creates a prompt with current research data and goal
-    2. Asks AI to generate 5 more web search queries
-    3. Parses JSON response to extract new queries
+    1. Creates a prompt with summaries of any research data not yet in context, and the goal
+    2. Chains onto previous_response_id (normally the evaluation response)
+    3. Asks AI to generate 5 more web search queries
+    4. Extracts the JSON list of new queries from the response
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         goal (str): The research goal
-        collected_data (list): Current research results
+        collected_data (list): Research results not yet sent to the previous_response_id
+            context (empty when chaining onto evaluate_research_completeness())
         previous_response_id (str): Previous API response ID for context
     
     Returns:
-        list: List of new search queries
+        tuple: (queries_list, response_id) - List of new search queries and API response ID
     """
-    more_searches = client.responses.create(
-        model=MODEL,
-        input=[
-            {"role": "assistant", "content": f"Current data: {json.dumps(collected_data)}"},
-            {"role": "user", "content": f"This has not met the goal: {goal}. Write 5 other web searchs to achieve the goal"}
-        ],
+    messages = [_goal_message(goal)]
+    if collected_data:
+        messages.append({"role": "assistant", "content": f"Current data: {_summaries_json(collected_data)}"})
+    messages.append({"role": "user", "content": _ADDITIONAL_PROMPT})
+    
+    response = await _safe_responses_create(
+        client,
+        model=MODEL_MINI,
+        input=messages,
         instructions=DEVELOPER_MESSAGE,
         previous_response_id=previous_response_id
     )
     
-    queries_text = more_searches.output[0].content[0].text
-    queries = json.loads(queries_text)
+    queries = extract_json(response.output[0].content[0].text)
+    
+    return queries, response.id
+
+
+async def generate_verification_queries(client, goal, previous_response_id):
+    """
+    Generate search queries that double-check research already judged complete.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal
+        previous_response_id (str): Response ID holding the research context
+    
+    Returns:
+        tuple: (queries_list, response_id) - List of verification queries and API response ID
+    """
+    response = await _safe_responses_create(
+        client,
+        model=MODEL_MINI,
+        input=[_goal_message(goal), {"role": "user", "content": _VERIFY_PROMPT}],
+        instructions=DEVELOPER_MESSAGE,
+        previous_response_id=previous_response_id
+    )
     
-    return queries
+    return extract_json(response.output[0].content[0].text), response.id
 
 
 # ============================================================================
 # RESEARCH EXECUTION MODULE
 # ============================================================================
 
-def conduct_research_iteratively(client, goal, initial_queries, goal_response_id):
+async def iterate_research(client, goal, initial_queries, goal_response_id):
     """
-    Conduct research iteratively until the goal is satisfied.
+    Run the iterative research loop, yielding the state after every batch.
     
     Step-by-step:
     1. Starts with initial queries
-    2. Executes all queries and collects results
-    3. Evaluates if research is complete
-    4. If not complete, generates additional queries and repeats
-    5. Continues until evaluation returns True
+    2. Executes all not-yet-searched queries concurrently (asyncio) and collects results
+    3. Evaluates if research is complete, sending only the new results
+    4. Yields (collected_data, context_id, is_complete) for the batch
+    5. If not complete, generates additional queries and repeats
+    6. Continues until evaluation returns True, with a hard cap of
+       MAX_RESEARCH_ITERATIONS batches; also stops (with a logged warning)
+       when there is nothing new to search or at least QUERY_OVERLAP_LIMIT
+       of the follow-up queries were already searched
+    
+    Evaluation and query generation form one previous_response_id chain that
+    starts at the research plan, so each result is uploaded once rather than
+    on every iteration. Each yielded context_id is the latest link of that
+    chain, holding every result collected so far.
     
     Args:
-        client (OpenAI): Initialized OpenAI client
+        client (AsyncOpenAI): Initialized async OpenAI client
         goal (str): The research goal
         initial_queries (list): Initial list of search queries
         goal_response_id (str): Response ID from goal generation for context
     
-    Returns:
-        list: Complete list of research results
+    Yields:
+        tuple: (collected_data, context_id, is_complete) - Snapshot of all results so
+            far, the response ID holding the research context, and the verdict
     """
     collected = []
     queries = initial_queries
+    seen = set()
+    context_id = goal_response_id
+    sent = 0
     
-    for iteration in itertools.count():
-        # Execute all current queries
-        for q in queries:
-            collected.append(run_search(client, q))
+    for iteration in range(MAX_RESEARCH_ITERATIONS):
+        # Skip queries already searched in earlier iterations
+        queries = filter_new_queries(queries, seen)
+        if not queries:
+            logger.warning("Stopping research: no new queries to search")
+            return
         
-        # Check if we have enough information
-        if evaluate_research_completeness(client, goal, collected):
-            break
+        # Execute all current queries concurrently
+        collected.extend(await run_searches(client, queries))
         
-        # Generate more queries if needed
-        queries = generate_additional_queries(client, goal, collected, goal_response_id)
+        # Check if we have enough information (only new results are sent)
+        is_complete, context_id = await evaluate_research_completeness(
+            client, goal, collected[sent:], context_id
+        )
+        sent = len(collected)
+        yield list(collected), context_id, is_complete
+        if is_complete:
+            return
+        
+        if iteration + 1 == MAX_RESEARCH_ITERATIONS:
+            logger.warning("Stopping research after %d iterations without a complete verdict", MAX_RESEARCH_ITERATIONS)
+            return
+        
+        # Generate more queries if needed (the evaluation context already holds the data)
+        queries, context_id = await generate_additional_queries(client, goal, [], context_id)
+        
+        overlap = query_overlap(queries, seen)
+        if overlap >= QUERY_OVERLAP_LIMIT:
+            logger.warning("Stopping research: %.0f%% of the new queries were already searched", overlap * 100)
+            return
+
+
+async def conduct_research_iteratively(client, goal, initial_queries, goal_response_id):
+    """
+    Conduct research iteratively until the goal is satisfied or progress stalls.
+    
+    Runs iterate_research() to the end; see it for the loop and stopping rules.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal
+        initial_queries (list): Initial list of search queries
+        goal_response_id (str): Response ID from goal generation for context
+    
+    Returns:
+        list: Complete list of research results (possibly without a complete verdict)
+    """
+    collected = []
+    async for collected, _, _ in iterate_research(client, goal, initial_queries, goal_response_id):
+        pass
     
     return collected
 
 
+async def verify_research(client, goal, collected_data, context_id):
+    """
+    Run one verification search pass over research judged complete.
+    
+    Step-by-step:
+    1. Asks for queries that confirm the findings or fill gaps
+    2. Searches the ones not already searched
+    3. Keeps only the results that cite a page (by canonical URL, see
+       canonicalize_url()) that no collected result cites yet
+    
+    A verification search usually restates what is known from the same
+    sources; only new sources count as material, so the report is redone
+    only when there is something new to cite.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal
+        collected_data (list): All research results so far
+        context_id (str): Response ID holding the research context
+    
+    Returns:
+        list: Materially new results (empty if none)
+    """
+    queries, _ = await generate_verification_queries(client, goal, context_id)
+    queries = filter_new_queries(queries, {normalize_query(r["query"]) for r in collected_data})
+    if not queries:
+        return []
+    
+    known = {canonicalize_url(u) for r in collected_data for u in r.get("citations", [])}
+    return [
+        r for r in await run_searches(client, queries)
+        if any(canonicalize_url(u) not in known for u in r.get("citations", []))
+    ]
+
+
 # ============================================================================
 # REPORT GENERATION MODULE
 # ============================================================================
 
-def generate_final_report(client, goal, collected_data):
+# Query parameters that only track where a click came from
+_TRACKING_PARAM_RE = re.compile(r"^(utm_\w+|fbclid|gclid|ref|ref_src)$", re.IGNORECASE)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def canonicalize_url(url):
     """
-    Generate the final comprehensive research report.
+    Normalize a URL so trivially different links to one page compare equal.
+    
+    Lowercases the scheme and host, drops "www.", the fragment, tracking
+    parameters (utm_*, fbclid, ...) and any trailing slash, and sorts the
+    remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM_RE.match(k)
+    ))
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), query, ""))
+
+
+def simhash(text):
+    """64-bit SimHash of the word 3-grams of text (similar texts differ in few bits)."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+    
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _dedupe(collected_data):
+    """
+    Drop redundant search results before they are sent to the final report.
     
     Step-by-step:
-    1. Creates a prompt asking for a complete detailed report
-    2. Includes instructions for inline citations [n] and reference list
-    3. Uses all collected research data as input
-    4. Returns formatted markdown report
+    1. Canonicalizes each result's citation URLs
+    2. Goes through the results from the longest research output down
+    3. Drops a result only if a longer one already kept cites the same set of
+       pages AND has a SimHash within SIMHASH_MAX_DISTANCE bits of it
+    
+    Each result is a model answer to its own query, so citing the same pages
+    alone does not make two results redundant (e.g. the history and the
+    economics of a topic, both from its Wikipedia article).
+    
+    Results keep their original order; each kept result's citations are its
+    canonicalized URLs.
     
     Args:
-        client (OpenAI): Initialized OpenAI client
-        goal (str): The research goal
         collected_data (list): All collected research results
     
     Returns:
-        str: Final research report in markdown format
+        list: The deduplicated results
+    """
+    by_length = sorted(
+        range(len(collected_data)),
+        key=lambda i: -len(collected_data[i]["research_output"])
+    )
+    
+    kept = []
+    hashes_by_sources = {}  # frozenset of canonical URLs -> SimHashes of kept results
+    for index in by_length:
+        result = collected_data[index]
+        urls = list(dict.fromkeys(canonicalize_url(u) for u in result.get("citations", [])))
+        hashes = hashes_by_sources.setdefault(frozenset(urls), [])
+        h = simhash(result["research_output"])
+        if any(bin(h ^ other).count("1") <= SIMHASH_MAX_DISTANCE for other in hashes):
+            continue
+        hashes.append(h)
+        kept.append((index, urls))
+    
+    return [{**collected_data[index], "citations": urls} for index, urls in sorted(kept)]
+
+
+def _dumps(value):
     """
-    report = client.responses.create(
-        model=MODEL,
+    Serialize research data to a JSON string with orjson.
+    
+    Much faster than json.dumps on large result lists, and non-ASCII text is
+    written as-is instead of \\u escapes, which also costs fewer tokens.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _final_report_input(goal, collected_data, previous_response_id=None):
+    """Build the input messages for the final report call."""
+    if previous_response_id:
+        return [{"role": "user", "content": _REPORT_CHAINED_PROMPT}]
+    
+    deduped = _dedupe(collected_data)
+    payload = _dumps(deduped)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Deduplicated %d results to %d for the report (%d -> %d tokens)",
+            len(collected_data), len(deduped),
+            count_tokens(_dumps(collected_data)), count_tokens(payload)
+        )
+    
+    return [
+        _goal_message(goal),
+        {"role": "assistant", "content": payload},
+        {"role": "user", "content": _REPORT_PROMPT}
+    ]
+
+
+def _numbered_sources(collected_data):
+    """Number each distinct cited URL once, in order of first citation: {url: n}."""
+    numbers = {}
+    for result in collected_data:
+        for url in result.get("citations", []):
+            numbers.setdefault(url, len(numbers) + 1)
+    return numbers
+
+
+def _chunk_results(collected_data, numbers, max_tokens):
+    """
+    Pack results into JSON list strings of at most max_tokens tokens each.
+    
+    Each result's citations are replaced by "[n] url" strings using the
+    global source numbers, so summaries of different chunks cite alike. A
+    single result larger than max_tokens gets a chunk of its own.
+    """
+    chunks, chunk, size = [], [], 0
+    for result in collected_data:
+        entry = _dumps({
+            "query": result["query"],
+            "research_output": result["research_output"],
+            "sources": [f"[{numbers[url]}] {url}" for url in result.get("citations", [])]
+        })
+        tokens = count_tokens(entry)
+        if chunk and size + tokens > max_tokens:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(entry)
+        size += tokens
+    if chunk:
+        chunks.append(chunk)
+    
+    return ["[" + ", ".join(c) + "]" for c in chunks]
+
+
+async def _summarize_chunk(client, goal, chunk):
+    """Map step: summarize one chunk of results, keeping their [n] source numbers."""
+    summary = await _safe_responses_create(
+        client,
+        model=MODEL_MINI,
         input=[
-            {"role": "developer", "content": (
-                f"Write a complete and detailed report about research goal: {goal}"
-                "Cite Sources inline using [n] and append a reference "
-                "list mapping [n] to url"
-            )},
-            {"role": "assistant", "content": json.dumps(collected_data)}
+            _goal_message(goal),
+            {"role": "assistant", "content": chunk},
+            {"role": "user", "content": _MAP_PROMPT}
         ],
         instructions=DEVELOPER_MESSAGE
     )
+    return summary.output[0].content[0].text
+
+
+async def _map_reduce_input(client, goal, collected_data):
+    """
+    Build report input messages for results too large for one prompt.
+    
+    Step-by-step:
+    1. Numbers every cited URL once across all results
+    2. Splits the results into chunks of at most REPORT_CHUNK_TOKENS tokens
+    3. Summarizes all chunks concurrently (asyncio.gather, within the API limits)
+    4. Returns the summaries plus the global [n] -> url list for the report call
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal
+        collected_data (list): Deduplicated research results
+    
+    Returns:
+        list: Input messages for the reduce (report) call
+    """
+    numbers = _numbered_sources(collected_data)
+    chunks = _chunk_results(collected_data, numbers, REPORT_CHUNK_TOKENS)
+    summaries = await asyncio.gather(*(_summarize_chunk(client, goal, c) for c in chunks))
+    
+    references = "\n".join(f"[{n}] {url}" for url, n in numbers.items())
+    return [
+        _goal_message(goal),
+        {"role": "assistant", "content": "\n\n".join(summaries) + "\n\nSources:\n" + references},
+        {"role": "user", "content": _REDUCE_PROMPT}
+    ]
+
+
+class ReportHandle:
+    """
+    A final report that is produced lazily, as it streams.
+    
+    Iterate it (async for) to receive the report chunk by chunk without
+    holding the whole text, or await text() for the full string. The stream
+    can be consumed only once: text() keeps (and response-caches) what it
+    reads, plain iteration does neither. Nothing is requested from the API
+    until one of them is used, and the stream is closed however it ends.
+    """
+    
+    def __init__(self, open_stream):
+        # open_stream(cache) -> async generator of chunks; cache=True buffers
+        # the report to store it in the response cache
+        self._open_stream = open_stream
+        self._text = None
+        self._consumed = False
     
-    return report.output[0].content[0].text
+    @classmethod
+    def from_text(cls, text):
+        """Wrap an already complete report."""
+        handle = cls(None)
+        handle._text = text
+        return handle
+    
+    def _take_stream(self, cache):
+        if self._consumed:
+            raise RuntimeError("The report stream has already been consumed")
+        self._consumed = True
+        return self._open_stream(cache)
+    
+    async def __aiter__(self):
+        if self._text is not None:
+            yield self._text
+            return
+        stream = self._take_stream(cache=False)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+    
+    async def text(self):
+        """Return the full report, reading (and caching) the stream if needed."""
+        if self._text is None:
+            stream = self._take_stream(cache=True)
+            try:
+                self._text = "".join([chunk async for chunk in stream])
+            finally:
+                await stream.aclose()
+        return self._text
+
+
+def generate_final_report(client, goal, collected_data, previous_response_id=None,
+                          min_tokens_before_yield=1):
+    """
+    Generate the final comprehensive research report, streamed as it is written.
+    
+    Returns at once: the request is made when the returned ReportHandle is
+    first iterated or its text() awaited.
+    
+    Step-by-step:
+    1. Creates a prompt asking for a complete detailed report
+    2. Includes instructions for inline citations [n] and reference list
+    3. Uses all collected research data (full research outputs) as input, or,
+       if asked to, chains onto previous_response_id and sends only a short directive
+    4. Yields the markdown report in chunks as the model writes it (or, for
+       text(), the cached report of an identical unchained request),
+       capped at REPORT_MAX_TOKENS output tokens; a report cut off there
+       ends with a note saying so (and a warning is logged)
+    
+    collected_data is deduplicated (see _dedupe()) and sent in full; if it is
+    more than REPORT_INPUT_BUDGET tokens it is map-reduced (see
+    _map_reduce_input()) rather than sent in one oversized prompt. Chaining is
+    opt-in and lossy: the payload no longer grows with the research, but the
+    context built by iterate_research() only holds the result
+    summaries (see summarize_result()), so the report is written from those.
+    
+    Callers that need the whole report await handle.text(), which also stores
+    it in the response cache; a UI can iterate the handle and render from the
+    first token instead of waiting for the full response, without the report
+    being buffered. Each streamed delta is about one token;
+    min_tokens_before_yield > 1 joins that many deltas per chunk, so a UI
+    re-renders less often.
+    
+    Args:
+        client (AsyncOpenAI): Initialized async OpenAI client
+        goal (str): The research goal
+        collected_data (list): All collected research results
+        previous_response_id (str, optional): Response ID holding the research context,
+            to write the report from the summaries in it instead of collected_data
+        min_tokens_before_yield (int): Number of deltas to batch into each chunk
+    
+    Returns:
+        ReportHandle: The report, yielding successive chunks of markdown
+    """
+    return ReportHandle(lambda cache: _iter_on_client_loop(_stream_final_report(
+        client, goal, collected_data, previous_response_id, min_tokens_before_yield, cache
+    )))
+
+
+async def _stream_final_report(client, goal, collected_data, previous_response_id,
+                               min_tokens_before_yield, cache):
+    """
+    Async generator behind generate_final_report()'s ReportHandle.
+    
+    With cache=False the report is only streamed: it is neither looked up in
+    nor buffered for the response cache (which only text() reads and fills).
+    """
+    kwargs = {
+        "model": MODEL,
+        "input": _final_report_input(goal, collected_data, previous_response_id),
+        "instructions": DEVELOPER_MESSAGE,
+        "max_output_tokens": REPORT_MAX_TOKENS
+    }
+    
+    if previous_response_id:
+        kwargs["previous_response_id"] = previous_response_id
+    
+    # A repeated report request replays the cached report as a single chunk
+    # (a chained request follows a fresh response ID, so it is never cached)
+    cache = cache and not previous_response_id
+    if cache:
+        key = _response_cache_key(goal, kwargs)
+        cached = _response_cache_get(key)
+        if cached is not None:
+            yield cached[0]
+            return
+    
+    # Cached under the direct request above, so the map step is skipped on a hit
+    if not previous_response_id and estimate_tokens(kwargs) > REPORT_INPUT_BUDGET:
+        logger.info("Report input exceeds %d tokens; summarizing it in chunks", REPORT_INPUT_BUDGET)
+        kwargs["input"] = await _map_reduce_input(client, goal, _dedupe(collected_data))
+    
+    # Same retry policy as _safe_responses_create(), but only until the first
+    # chunk is out: a stream that fails midway cannot be replayed
+    yielded = False
+    retrying = AsyncRetrying(
+        retry=retry_if_exception(lambda e: _is_transient(e) and not yielded),
+        wait=_wait_for_retry,
+        stop=stop_after_attempt(6),
+        reraise=True
+    )
+    async for attempt in retrying:
+        with attempt:
+            chunks, pending = [], []
+            async with _throttled(client, kwargs), client.responses.stream(**kwargs) as stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        if cache:
+                            chunks.append(event.delta)
+                        pending.append(event.delta)
+                        if len(pending) >= min_tokens_before_yield:
+                            yielded = True
+                            yield "".join(pending)
+                            pending.clear()
+                final = await stream.get_final_response()
+            if pending:
+                yield "".join(pending)
+    
+    # A report cut off by REPORT_MAX_TOKENS ends before its reference list
+    if final.status == "incomplete":
+        reason = getattr(final.incomplete_details, "reason", None)
+        logger.warning("The final report was cut off (%s); its reference list may be missing", reason)
+        if cache:
+            chunks.append(_TRUNCATED_NOTE)
+        yield _TRUNCATED_NOTE
+    
+    if cache:
+        _response_cache_set(key, "".join(chunks), final.id)
 
 
 # ============================================================================
 # MAIN EXECUTION FUNCTION
 # ============================================================================
 
-def run_deep_research(topic, answers, api_key=None):
+async def arun_deep_research(topic, answers=None, api_key=None, verify=False):
     """
-    Main function to execute the complete deep research process.
+    Main coroutine to execute the complete deep research process.
     
     Step-by-step execution flow:
     1. Setup OpenAI client
-    2. Generate clarifying questions (if answers not provided)
+    2. Generate clarifying questions (only if answers not provided)
     3. Generate research goal and initial queries
     4. Conduct iterative research until goal is met
     5. Generate final comprehensive report
     
+    With verify=True, research judged complete gets one more search pass
+    (see verify_research()) while the report is already being written from
+    the data so far. If the pass finds new sources the draft is cancelled and
+    the report restarted with them; otherwise the draft is used.
+    The report is then read in full before returning.
+    
+    When answers are supplied up front there is no one to put the questions
+    to, so step 2 is skipped: the plan is built from the topic and answers
+    alone, with no questions round-trip, and "questions" in the result is an
+    empty list. With answers=None the questions are still generated (and
+    returned for reference) and the plan is written without answers.
+    
     Args:
         topic (str): Research topic
-        answers (list): List of answers to clarifying questions
+        answers (list, optional): Answers / notes about the purpose of the research
         api_key (str, optional): OpenAI API key
+        verify (bool): Run a verification pass in parallel with the report
     
     Returns:
-        dict: Dictionary containing goal, questions, and final report
+        dict: Dictionary containing goal, questions, and the final report as a
+            ReportHandle (iterate it to stream, or await its text())
     """
     # Step 1: Setup
-    client = setup_openai_client(api_key)
+    client = get_client(api_key)
     
-    # Step 2: Generate questions (for reference)
-    questions, questions_response_id = generate_clarifying_questions(client, topic)
+    # Step 2: Generate questions (for reference) unless answers were supplied
+    if answers is None:
+        questions, questions_response_id = await generate_clarifying_questions(client, topic)
+        answers = []
+    else:
+        questions, questions_response_id = [], None
     
     # Step 3: Generate research plan
-    goal, queries, goal_response_id = generate_research_plan(
+    goal, queries, goal_response_id = await generate_research_plan(
         client, topic, questions, answers, questions_response_id
     )
     
     # Step 4: Conduct research iteratively
-    collected_data = conduct_research_iteratively(client, goal, queries, goal_response_id)
+    collected_data, context_id, is_complete = [], goal_response_id, False
+    async for collected_data, context_id, is_complete in iterate_research(client, goal, queries, goal_response_id):
+        pass
     
-    # Step 5: Generate final report
-    final_report = generate_final_report(client, goal, collected_data)
+    # Step 5: Final report from the full research outputs (streamed when read);
+    # the chained context_id only holds summaries, so it is not passed on
+    if verify and is_complete:
+        # Draft the report while the verification pass runs
+        draft = asyncio.create_task(generate_final_report(client, goal, collected_data).text())
+        try:
+            new_results = await verify_research(client, goal, collected_data, context_id)
+        except BaseException:
+            draft.cancel()
+            raise
+        
+        if new_results:
+            logger.info("Verification found %d new results; restarting the report", len(new_results))
+            draft.cancel()
+            await asyncio.gather(draft, return_exceptions=True)
+            collected_data = collected_data + new_results
+            final_report = ReportHandle.from_text(
+                await generate_final_report(client, goal, collected_data).text()
+            )
+        else:
+            final_report = ReportHandle.from_text(await draft)
+    else:
+        final_report = generate_final_report(client, goal, collected_data)
     
     return {
         "goal": goal,
         "questions": questions,
         "report": final_report
     }
+
+
+async def _with_report_text(result):
+    """Replace a pipeline result's ReportHandle with the report text."""
+    result["report"] = await result["report"].text()
+    return result
+
+
+def run_deep_research(topic, answers=None, api_key=None, verify=False):
+    """
+    Synchronous wrapper around arun_deep_research(), kept for existing callers.
+    
+    Runs the pipeline on the shared background event loop, so it also works
+    from code that already has a running loop (async callers should await
+    arun_deep_research() directly).
+    
+    Args:
+        topic (str): Research topic
+        answers (list, optional): Answers / notes about the purpose of the research
+        api_key (str, optional): OpenAI API key
+        verify (bool): Run a verification pass in parallel with the report
+    
+    Returns:
+        dict: Dictionary containing goal, questions, and final report text
+    """
+    async def research():
+        return await _with_report_text(await arun_deep_research(topic, answers, api_key, verify))
+    
+    return run_async(research())
+
+
+async def arun_deep_research_batch(items, api_key=None):
+    """
+    Research several topics concurrently in one process.
+    
+    Each (topic, answers) pair runs arun_deep_research() as its own task in an
+    asyncio.TaskGroup, so the pipelines' network waits overlap while the shared
+    API limits (see _safe_responses_create()) still bound the total load. If
+    any pipeline fails, the others are cancelled and the error is raised.
+    
+    Args:
+        items (list): (topic, answers) pairs; answers may be None as in arun_deep_research()
+        api_key (str, optional): OpenAI API key
+    
+    Returns:
+        list: One result dictionary per item (reports as ReportHandles), in input order
+    """
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(arun_deep_research(topic, answers, api_key)) for topic, answers in items]
+    return [task.result() for task in tasks]
+
+
+def run_deep_research_batch(items, api_key=None):
+    """
+    Synchronous wrapper around arun_deep_research_batch().
+    
+    The reports are read concurrently in an asyncio.TaskGroup too, so if one
+    fails the others are cancelled and the error is raised.
+    
+    Args:
+        items (list): (topic, answers) pairs; answers may be None
+        api_key (str, optional): OpenAI API key
+    
+    Returns:
+        list: One result dictionary per item (with report text), in input order
+    """
+    async def research():
+        results = await arun_deep_research_batch(items, api_key)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_with_report_text(r)) for r in results]
+        return [task.result() for task in tasks]
+    
+    return run_async(research())
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+import deep_research_clone as drc
+
+
+def test_a_failed_report_cancels_the_others(monkeypatch):
+    cancelled = []
+    
+    def failing(cache):
+        async def stream():
+            raise RuntimeError("stream failed")
+            yield
+        return stream()
+    
+    def slow(cache):
+        async def stream():
+            try:
+                await asyncio.sleep(60)
+                yield "never"
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return stream()
+    
+    async def arun_deep_research_batch(items, api_key=None):
+        return [{"goal": "g1", "report": drc.ReportHandle(slow)}, {"goal": "g2", "report": drc.ReportHandle(failing)}]
+    
+    monkeypatch.setattr(drc, "arun_deep_research_batch", arun_deep_research_batch)
+    
+    with pytest.raises(ExceptionGroup) as excinfo:
+        drc.run_deep_research_batch([("t1", None), ("t2", None)])
+    assert excinfo.group_contains(RuntimeError, match="stream failed")
+    assert cancelled == [True]
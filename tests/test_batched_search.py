@@ -0,0 +1,59 @@
+import asyncio
+import types
+
+import orjson
+
+import deep_research_clone as drc
+
+
+WIKI = "https://en.wikipedia.org/wiki/Printing_press"
+BRITANNICA = "https://www.britannica.com/technology/printing-press"
+
+
+def citation(url):
+    return types.SimpleNamespace(type="url_citation", url=url)
+
+
+class FakeClient:
+    """Answers a batched search with the given JSON items, citing only WIKI and BRITANNICA."""
+    
+    def __init__(self, items):
+        self.items = items
+        self.responses = types.SimpleNamespace(create=self.create)
+    
+    async def create(self, **kwargs):
+        content = types.SimpleNamespace(
+            text=orjson.dumps(self.items).decode(),
+            annotations=[citation(WIKI), citation(BRITANNICA)]
+        )
+        message = types.SimpleNamespace(id="msg-id", content=[content])
+        return types.SimpleNamespace(id="resp-id", output=[types.SimpleNamespace(type="web_search_call"), message])
+
+
+def search(items):
+    return asyncio.run(drc._run_searches_marshaled(FakeClient(items), [item["query"] for item in items]))
+
+
+def test_invented_sources_are_dropped():
+    results = search([
+        {"query": "q1", "research_output": "a", "sources": [WIKI + "#History", "https://invented.example/page"]},
+        {"query": "q2", "research_output": "b", "sources": ["https://another.example/made-up"]},
+    ])
+    
+    assert [r["citations"] for r in results] == [[WIKI], []]
+
+
+def test_a_single_source_string_is_one_url():
+    results = search([{"query": "q1", "research_output": "a", "sources": BRITANNICA}])
+    
+    assert results[0]["citations"] == [BRITANNICA]
+
+
+def test_missing_or_malformed_sources_give_no_citations():
+    results = search([
+        {"query": "q1", "research_output": "a"},
+        {"query": "q2", "research_output": "b", "sources": [None, 3, {"url": WIKI}]},
+        {"query": "q3", "research_output": "c", "sources": {"url": WIKI}},
+    ])
+    
+    assert [r["citations"] for r in results] == [[], [], []]
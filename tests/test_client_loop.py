@@ -0,0 +1,89 @@
+import asyncio
+import types
+
+import deep_research_clone as drc
+
+
+def delta(text):
+    return types.SimpleNamespace(type="response.output_text.delta", delta=text)
+
+
+class FakeStream:
+    def __init__(self, client):
+        self.client = client
+    
+    async def __aenter__(self):
+        self.client.loops.append(asyncio.get_running_loop())
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.client.closed = True
+    
+    async def __aiter__(self):
+        for text in ("# Report", "\n\nBody"):
+            yield delta(text)
+    
+    async def get_final_response(self):
+        if self.client.truncated:
+            details = types.SimpleNamespace(reason="max_output_tokens")
+            return types.SimpleNamespace(id="report-id", status="incomplete", incomplete_details=details)
+        return types.SimpleNamespace(id="report-id", status="completed", incomplete_details=None)
+
+
+class FakeClient:
+    """Records the loop each request runs on."""
+    
+    def __init__(self, truncated=False):
+        self.loops = []
+        self.closed = False
+        self.truncated = truncated
+        self.responses = types.SimpleNamespace(create=self.create, stream=lambda **kwargs: FakeStream(self))
+    
+    async def create(self, **kwargs):
+        self.loops.append(asyncio.get_running_loop())
+        content = types.SimpleNamespace(text="1. Why?")
+        return types.SimpleNamespace(id="resp-id", output=[types.SimpleNamespace(content=[content])])
+
+
+RESULTS = [{"query": "q", "research_output": "Findings.", "citations": []}]
+
+
+def test_calls_from_another_loop_run_on_the_background_loop():
+    client = FakeClient()
+    
+    questions, _ = asyncio.run(drc.generate_clarifying_questions(client, "topic"))
+    
+    assert questions == ["1. Why?"]
+    assert client.loops == [drc._background_loop()]
+
+
+def test_report_streams_on_the_background_loop():
+    client = FakeClient()
+    
+    async def collect():
+        return [chunk async for chunk in drc.generate_final_report(client, "goal", RESULTS)]
+    
+    assert asyncio.run(collect()) == ["# Report", "\n\nBody"]
+    assert client.loops == [drc._background_loop()]
+
+
+def test_abandoned_report_stream_is_closed():
+    client = FakeClient()
+    
+    async def first_chunk():
+        chunks = aiter(drc.generate_final_report(client, "goal", RESULTS))
+        chunk = await anext(chunks)
+        await chunks.aclose()
+        return chunk
+    
+    assert asyncio.run(first_chunk()) == "# Report"
+    assert client.closed
+
+
+def test_truncated_report_says_so(caplog):
+    client = FakeClient(truncated=True)
+    
+    text = asyncio.run(drc.generate_final_report(client, "goal", RESULTS).text())
+    
+    assert text == "# Report\n\nBody" + drc._TRUNCATED_NOTE
+    assert "max_output_tokens" in caplog.text
@@ -0,0 +1,76 @@
+import deep_research_clone as drc
+
+
+WIKI = "https://en.wikipedia.org/wiki/Printing_press"
+
+HISTORY = (
+    "The printing press was invented by Johannes Gutenberg around 1440 in Mainz. "
+    "Movable metal type, oil-based ink and a screw press let workshops produce books "
+    "far faster than scribes, and presses spread to over two hundred European cities by 1500."
+)
+ECONOMICS = (
+    "Cheaper books shifted the economics of knowledge: falling prices widened literacy, "
+    "created a market for pamphlets and newspapers, and turned printers into merchants "
+    "who financed paper, labour and distribution networks across trading towns."
+)
+
+
+def result(query, output, citations):
+    return {"query": query, "research_output": output, "citations": citations}
+
+
+def test_canonicalize_url_normalizes_trivial_differences():
+    assert drc.canonicalize_url("HTTPS://WWW.Example.com/a/b/#section") == "https://example.com/a/b"
+    assert drc.canonicalize_url("https://example.com/a?utm_source=x&b=2&a=1&fbclid=y") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert drc.canonicalize_url(" https://example.com/a/ ") == "https://example.com/a"
+
+
+def test_canonicalize_url_keeps_distinct_pages_distinct():
+    assert drc.canonicalize_url("https://example.com/a") != drc.canonicalize_url("https://example.com/b")
+    assert drc.canonicalize_url("https://example.com/a?id=1") != drc.canonicalize_url("https://example.com/a?id=2")
+
+
+def test_dedupe_keeps_different_answers_citing_the_same_page():
+    data = [
+        result("history of the printing press", HISTORY, [WIKI]),
+        result("economics of the printing press", ECONOMICS, [WIKI + "#Economics"]),
+    ]
+    
+    deduped = drc._dedupe(data)
+    
+    assert [r["query"] for r in deduped] == [r["query"] for r in data]
+    assert all(r["citations"] == [WIKI] for r in deduped)
+
+
+def test_dedupe_drops_near_duplicate_with_the_same_sources():
+    data = [
+        result("when was the press invented", HISTORY, [WIKI]),
+        result("who invented the press", HISTORY + " It changed Europe.", ["https://www." + WIKI[8:] + "/"]),
+    ]
+    
+    deduped = drc._dedupe(data)
+    
+    assert len(deduped) == 1
+    assert deduped[0]["query"] == "who invented the press"
+    assert deduped[0]["citations"] == [WIKI]
+
+
+def test_dedupe_keeps_same_text_from_different_sources():
+    data = [
+        result("press history", HISTORY, [WIKI]),
+        result("press history again", HISTORY, ["https://www.britannica.com/technology/printing-press"]),
+    ]
+    
+    assert len(drc._dedupe(data)) == 2
+
+
+def test_dedupe_preserves_original_order():
+    data = [
+        result("short", "A short note about ink.", []),
+        result("history", HISTORY, [WIKI]),
+        result("economics", ECONOMICS, [WIKI]),
+    ]
+    
+    assert [r["query"] for r in drc._dedupe(data)] == ["short", "history", "economics"]
@@ -0,0 +1,44 @@
+import asyncio
+import gc
+import types
+
+import deep_research_clone as drc
+
+
+class FakeClient:
+    def __init__(self):
+        self.responses = types.SimpleNamespace(create=self.create)
+    
+    async def create(self, **kwargs):
+        await asyncio.sleep(0)
+        content = types.SimpleNamespace(text="1. Why?")
+        return types.SimpleNamespace(id="resp-id", output=[types.SimpleNamespace(content=[content])])
+
+
+def test_each_client_has_its_own_limits():
+    first, second = FakeClient(), FakeClient()
+    
+    async def both():
+        await asyncio.gather(
+            drc.generate_clarifying_questions(first, "topic"),
+            drc.generate_clarifying_questions(second, "topic")
+        )
+    
+    asyncio.run(both())
+    
+    assert drc._limits[first] is not drc._limits[second]
+
+
+def test_limits_do_not_accumulate_across_event_loops():
+    client = FakeClient()
+    
+    async def contended():
+        await asyncio.gather(*(drc.generate_clarifying_questions(client, "topic") for _ in range(drc.API_CONCURRENCY * 2)))
+    
+    for _ in range(5):
+        asyncio.run(contended())
+    assert client in drc._limits
+    
+    del client
+    gc.collect()
+    assert not any(isinstance(c, FakeClient) for c in list(drc._limits.keys()))
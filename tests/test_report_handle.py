@@ -0,0 +1,91 @@
+import asyncio
+
+import deep_research_clone as drc
+
+
+class FakeStream:
+    """Stands in for _stream_final_report(): records how it was opened and closed."""
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.cache = None
+        self.closed = False
+    
+    def __call__(self, cache):
+        self.cache = cache
+        return self._generate()
+    
+    async def _generate(self):
+        try:
+            for chunk in self.chunks:
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def test_text_reads_the_whole_report_with_caching():
+    stream = FakeStream(["# Report", "\n\nBody"])
+    handle = drc.ReportHandle(stream)
+    
+    assert asyncio.run(handle.text()) == "# Report\n\nBody"
+    assert stream.cache is True
+    assert stream.closed
+    assert asyncio.run(handle.text()) == "# Report\n\nBody"
+
+
+def test_iteration_streams_without_caching():
+    stream = FakeStream(["a", "b", "c"])
+    
+    async def collect():
+        return [chunk async for chunk in drc.ReportHandle(stream)]
+    
+    assert asyncio.run(collect()) == ["a", "b", "c"]
+    assert stream.cache is False
+    assert stream.closed
+
+
+def test_stopping_early_closes_the_inner_stream():
+    stream = FakeStream(["a", "b", "c"])
+    
+    async def first_chunk():
+        agen = aiter(drc.ReportHandle(stream))
+        chunk = await anext(agen)
+        await agen.aclose()
+        return chunk
+    
+    assert asyncio.run(first_chunk()) == "a"
+    assert stream.closed
+
+
+def test_iter_async_closes_the_inner_stream_when_abandoned():
+    stream = FakeStream(["a", "b", "c"])
+    chunks = drc.iter_async(drc.ReportHandle(stream))
+    
+    assert next(chunks) == "a"
+    chunks.close()
+    assert stream.closed
+
+
+def test_stream_is_consumed_only_once():
+    fresh = drc.ReportHandle(FakeStream(["a"]))
+    
+    async def collect():
+        return [chunk async for chunk in fresh]
+    
+    asyncio.run(collect())
+    try:
+        asyncio.run(fresh.text())
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("a consumed stream was read twice")
+
+
+def test_from_text_needs_no_stream():
+    handle = drc.ReportHandle.from_text("done")
+    
+    async def collect():
+        return [chunk async for chunk in handle]
+    
+    assert asyncio.run(collect()) == ["done"]
+    assert asyncio.run(handle.text()) == "done"
@@ -0,0 +1,47 @@
+import asyncio
+import types
+
+import deep_research_clone as drc
+
+
+class FakeClient:
+    """Answers every responses.create() with a new response ID."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.responses = types.SimpleNamespace(create=self.create)
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        content = types.SimpleNamespace(text='{"complete": true}')
+        return types.SimpleNamespace(id=f"resp-{self.calls}", output=[types.SimpleNamespace(content=[content])])
+
+
+def ask_twice(client, **kwargs):
+    async def run():
+        first = await drc.cached_responses_create(client, "goal", **kwargs)
+        second = await drc.cached_responses_create(client, "goal", **kwargs)
+        return first, second
+    
+    return asyncio.run(run())
+
+
+def test_identical_unchained_requests_hit_the_cache():
+    client = FakeClient()
+    drc._response_cache.clear()
+    
+    first, second = ask_twice(client, model=drc.MODEL_MINI, input="same question")
+    
+    assert client.calls == 1
+    assert first == second == ('{"complete": true}', "resp-1")
+
+
+def test_chained_requests_bypass_the_cache():
+    client = FakeClient()
+    drc._response_cache.clear()
+    
+    first, second = ask_twice(client, model=drc.MODEL_MINI, input="same question", previous_response_id="resp-0")
+    
+    assert client.calls == 2
+    assert first[1] != second[1]
+    assert not drc._response_cache
@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+import deep_research_clone as drc
+
+
+def rate_limit_error(code):
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+    return openai.RateLimitError("rate limited", response=response, body={"code": code})
+
+
+class FailingClient:
+    """Raises the given error on every responses.create() call."""
+    
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+        self.responses = self
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def test_transient_errors():
+    assert drc._is_transient(rate_limit_error("rate_limit_exceeded"))
+    assert drc._is_transient(openai.APIConnectionError(request=httpx.Request("GET", "https://api.openai.com")))
+    assert not drc._is_transient(rate_limit_error("insufficient_quota"))
+    assert not drc._is_transient(ValueError("bad JSON"))
+
+
+def test_exhausted_quota_is_not_retried():
+    client = FailingClient(rate_limit_error("insufficient_quota"))
+    
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(drc.generate_clarifying_questions(client, "topic"))
+    assert client.calls == 1
@@ -0,0 +1,44 @@
+import asyncio
+
+import deep_research_clone as drc
+
+
+WIKI = "https://en.wikipedia.org/wiki/Printing_press"
+BRITANNICA = "https://www.britannica.com/technology/printing-press"
+
+COLLECTED = [
+    {"query": "history of the printing press", "research_output": "Gutenberg, c. 1440.", "citations": [WIKI]},
+]
+
+
+def fake_pipeline(monkeypatch, results):
+    calls = {"searched": None}
+    
+    async def generate_verification_queries(client, goal, previous_response_id):
+        return ["who invented the printing press", "History of the printing press"], "verify-id"
+    
+    async def run_searches(client, queries):
+        calls["searched"] = queries
+        return results
+    
+    monkeypatch.setattr(drc, "generate_verification_queries", generate_verification_queries)
+    monkeypatch.setattr(drc, "run_searches", run_searches)
+    return calls
+
+
+def test_results_citing_known_pages_are_not_material(monkeypatch):
+    calls = fake_pipeline(monkeypatch, [
+        {"query": "who invented the printing press", "research_output": "Johannes Gutenberg.",
+         "citations": ["https://www.en.wikipedia.org/wiki/Printing_press/#History"]},
+    ])
+    
+    assert asyncio.run(drc.verify_research(None, "goal", COLLECTED, "context-id")) == []
+    assert calls["searched"] == ["who invented the printing press"]
+
+
+def test_results_citing_new_pages_are_material(monkeypatch):
+    new = {"query": "who invented the printing press", "research_output": "Johannes Gutenberg.",
+           "citations": [WIKI, BRITANNICA]}
+    fake_pipeline(monkeypatch, [new])
+    
+    assert asyncio.run(drc.verify_research(None, "goal", COLLECTED, "context-id")) == [new]